@@ -3,17 +3,47 @@ Video KYC Recording Assistant & AI Checker
 Flask application for recording guidance and video analysis
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
-import json
+from flask import Flask, Request, render_template, request, jsonify, send_from_directory
+import functools
+import hashlib
+import orjson
 import os
+import shutil
+import subprocess
+import tempfile
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# SIMD-accelerated base64 codec when available, stdlib otherwise
+try:
+    import pybase64 as base64
+    b64decode_buffer = base64.b64decode_as_bytearray
+except ImportError:
+    import base64
+    b64decode_buffer = base64.b64decode
+
+# Uploaded file parts stay in memory up to this size before spilling to disk
+# (Werkzeug's default is 500KB, which sends every document image to disk)
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024  # 8MB
+
+
+class KYCRequest(Request):
+    """Request with a larger in-memory spool for uploaded files"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, mode='rb+')
+
+
 app = Flask(__name__)
+app.request_class = KYCRequest
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size
 app.config['UPLOAD_FOLDER'] = 'data/videos'
 app.config['DOCUMENTS_FOLDER'] = 'data/documents'
 app.config['ANALYSIS_FOLDER'] = 'outputs/analysis'
+# Let a fronting web server (Apache/lighttpd mod_xsendfile) transfer files
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
 
 # Ensure folders exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -25,31 +55,240 @@ os.makedirs('outputs/status', exist_ok=True)
 # Store analysis status (file-based to survive restarts)
 STATUS_DIR = 'outputs/status'
 
+# Parsed status files keyed by analysis ID -> ((mtime_ns, size), status_data),
+# oldest evicted first
+STATUS_CACHE_SIZE = 256
+_STATUS_CACHE = {}
+_STATUS_CACHE_LOCK = threading.Lock()
+
+# Minimum spacing between status writes that only nudge the progress value
+STATUS_WRITE_INTERVAL = 0.25  # seconds
+STATUS_MIN_PROGRESS_STEP = 1  # percent
+_LAST_STATUS_WRITE = {}  # analysis ID -> (monotonic time, status, stage, progress)
+
+# Statuses after which an analysis is never written again
+TERMINAL_STATUSES = frozenset({'completed', 'error'})
+
+# Threads used to read/parse status files in parallel
+STATUS_LOAD_WORKERS = 16
+
+# Raw report bytes keyed by result path -> (mtime_ns, bytes), oldest evicted first
+RESULT_CACHE_SIZE = 32
+_RESULT_CACHE = {}
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# Shared pool for writing captured document images
+_CAPTURE_WRITE_POOL = ThreadPoolExecutor(max_workers=8)
+
+# Browser cache lifetime for served output files
+OUTPUT_MAX_AGE = 3600  # 1 hour
+
+# Chunk size used when streaming uploaded files to disk
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+
+
+def stream_upload(file_storage, path):
+    """Stream an uploaded file to disk in fixed-size chunks"""
+    with open(path, 'wb') as out:
+        shutil.copyfileobj(file_storage.stream, out, UPLOAD_CHUNK_SIZE)
+
+
+def format_timestamp(ts, _strftime=time.strftime, _localtime=time.localtime):
+    """
+    Format a POSIX timestamp as local ISO-8601 (no datetime object churn)
+
+    Matches datetime.fromtimestamp(ts).isoformat(): microseconds are rounded
+    half-to-even and only shown when non-zero.
+    """
+    seconds = int(ts // 1)
+    us = round((ts - seconds) * 1e6)
+    if us >= 1000000:
+        seconds += 1
+        us -= 1000000
+    text = _strftime('%Y-%m-%dT%H:%M:%S', _localtime(seconds))
+    return f"{text}.{us:06d}" if us else text
+
+
+def write_bytes(path, buf):
+    """Write a bytes-like buffer to path with raw os.write() calls (no BufferedWriter)"""
+    view = memoryview(buf)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while view:
+            view = view[os.write(fd, view):]
+        return os.fstat(fd)
+    finally:
+        os.close(fd)
+
+
+def probe_codecs(path):
+    """Return (video_codec, audio_codec) of a media file via ffprobe, or Nones"""
+    try:
+        probe = subprocess.run([
+            'ffprobe', '-v', 'quiet',
+            '-print_format', 'json',
+            '-show_streams', path
+        ], check=True, capture_output=True)
+        streams = orjson.loads(probe.stdout).get('streams', [])
+    except (OSError, subprocess.CalledProcessError, orjson.JSONDecodeError):
+        return None, None
+
+    codecs = {}
+    for stream in streams:
+        codecs.setdefault(stream.get('codec_type'), stream.get('codec_name'))
+    return codecs.get('video'), codecs.get('audio')
+
+
+def json_response(data, status=200):
+    """Build a JSON response using orjson instead of Flask's encoder"""
+    return app.response_class(orjson.dumps(data), status=status, mimetype='application/json')
+
+
+def _status_cache_key(stat_result):
+    """Cache key that changes whenever the status file is rewritten"""
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _cache_status(analysis_id, key, status_data):
+    """Store a parsed status, evicting the oldest entries (call with _STATUS_CACHE_LOCK held)"""
+    _STATUS_CACHE.pop(analysis_id, None)
+    while len(_STATUS_CACHE) >= STATUS_CACHE_SIZE:
+        del _STATUS_CACHE[next(iter(_STATUS_CACHE))]
+    _STATUS_CACHE[analysis_id] = (key, status_data)
+
+
+def _should_write_status(analysis_id, status_data):
+    """Skip writes that only move progress by a fraction of a percent"""
+    now = time.monotonic()
+    status = status_data.get('status')
+    stage = status_data.get('stage')
+    progress = status_data.get('progress', 0)
+
+    with _STATUS_CACHE_LOCK:
+        last = _LAST_STATUS_WRITE.get(analysis_id)
+        if (last and last[1] == status and last[2] == stage
+                and now - last[0] < STATUS_WRITE_INTERVAL
+                and abs(progress - last[3]) < STATUS_MIN_PROGRESS_STEP):
+            return False
+        _LAST_STATUS_WRITE[analysis_id] = (now, status, stage, progress)
+    return True
+
+
+def load_result_bytes(result_path):
+    """Load a result JSON file's raw bytes (cached until the file changes)"""
+    mtime = os.stat(result_path).st_mtime_ns
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(result_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(result_path, 'rb') as f:
+        body = f.read()
+
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.pop(result_path, None)
+        while len(_RESULT_CACHE) >= RESULT_CACHE_SIZE:
+            del _RESULT_CACHE[next(iter(_RESULT_CACHE))]
+        _RESULT_CACHE[result_path] = (mtime, body)
+    return body
+
+
+def json_file_response(path):
+    """Serve a JSON file's bytes as-is (it is already JSON, no parse/re-encode)"""
+    return app.response_class(load_result_bytes(path), mimetype='application/json')
+
+
+def get_completed_result_path(analysis_id):
+    """
+    Look up the result file of a completed analysis
+
+    Returns:
+        Tuple of (result_path, error_message, http_status); result_path is
+        None when the analysis is missing, unfinished or has no result file
+    """
+    status_data = load_status(analysis_id)
+    if not status_data:
+        return None, 'Analysis not found', 404
+
+    if status_data['status'] != 'completed':
+        return None, 'Analysis not completed yet', 400
+
+    result_path = status_data.get('result_path')
+    if not result_path or not os.path.exists(result_path):
+        return None, 'Results file not found', 404
+
+    return result_path, None, 200
+
+
+def save_status(analysis_id, status_data, force=False):
+    """
+    Save analysis status to file (atomically, via rename)
+
+    Args:
+        analysis_id: Analysis ID
+        status_data: Status dictionary
+        force: Write even if _should_write_status would throttle it (for
+            callers that already rate-limit, like StatusFlusher)
+    """
+    if not force and not _should_write_status(analysis_id, status_data):
+        return
 
-def save_status(analysis_id, status_data):
-    """Save analysis status to file"""
     status_file = os.path.join(STATUS_DIR, f"{analysis_id}.json")
-    with open(status_file, 'w') as f:
-        json.dump(status_data, f, indent=2)
+    tmp_file = f"{status_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    # Single write() into a temp file, then rename over the old status so
+    # pollers never observe a half-written file. No fsync: status is
+    # recoverable and durability isn't worth the latency here.
+    key = _status_cache_key(write_bytes(tmp_file, orjson.dumps(status_data)))
+    os.replace(tmp_file, status_file)
+
+    # Keep the cache warm so the next poll doesn't re-parse what we just wrote
+    with _STATUS_CACHE_LOCK:
+        _cache_status(analysis_id, key, dict(status_data))
+        if status_data.get('status') in TERMINAL_STATUSES:
+            # No more writes to throttle for a finished analysis
+            _LAST_STATUS_WRITE.pop(analysis_id, None)
 
 
-def load_status(analysis_id):
-    """Load analysis status from file"""
+def load_status(analysis_id, stat_result=None):
+    """Load analysis status from file (cached until the file changes)"""
     status_file = os.path.join(STATUS_DIR, f"{analysis_id}.json")
-    if os.path.exists(status_file):
-        with open(status_file, 'r') as f:
-            return json.load(f)
-    return None
+    if stat_result is None:
+        try:
+            stat_result = os.stat(status_file)
+        except FileNotFoundError:
+            return None
+    key = _status_cache_key(stat_result)
+
+    with _STATUS_CACHE_LOCK:
+        cached = _STATUS_CACHE.get(analysis_id)
+    if cached and cached[0] == key:
+        return dict(cached[1])
+
+    try:
+        with open(status_file, 'rb') as f:
+            status_data = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+    with _STATUS_CACHE_LOCK:
+        _cache_status(analysis_id, key, status_data)
+    return dict(status_data)
 
 
 def get_all_status():
     """Get all analysis statuses"""
-    statuses = {}
-    for filename in os.listdir(STATUS_DIR):
-        if filename.endswith('.json'):
-            analysis_id = filename[:-5]
-            statuses[analysis_id] = load_status(analysis_id)
-    return statuses
+    with os.scandir(STATUS_DIR) as it:
+        entries = [e for e in it if e.name.endswith('.json')]
+    if not entries:
+        return {}
+
+    ids = [e.name[:-5] for e in entries]
+    stats = [e.stat() for e in entries]
+
+    # Reads release the GIL, so overlap them; unchanged files come from cache
+    with ThreadPoolExecutor(max_workers=min(STATUS_LOAD_WORKERS, len(ids))) as pool:
+        return dict(zip(ids, pool.map(load_status, ids, stats)))
 
 
 @app.route('/')
@@ -64,13 +303,87 @@ def recording_assistant():
     return render_template('recording_assistant.html')
 
 
+# KYC script file served to the recording assistant
+SCRIPT_PATH = 'data/scripts/rbi_kyc_script.json'
+
+# Raw script bytes, re-read only when the file changes: (mtime_ns, bytes)
+_SCRIPT_CACHE = None
+
+# Recording case templates (static, so the response body is built once)
+CASE_TEMPLATES = [
+    {
+        'id': 'case1',
+        'name': 'Case 1: Genuine - Approval',
+        'description': 'Everything goes smoothly, customer cooperates fully',
+        'expected_outcome': 'PASS',
+        'duration': '5-7 minutes',
+        'customer_behavior': 'Cooperative, answers all questions clearly, shows documents properly',
+        'special_instructions': 'Follow script exactly, customer should be natural and professional'
+    },
+    {
+        'id': 'case2',
+        'name': 'Case 2: Genuine with Minor Issues',
+        'description': 'Minor hesitation or technical issues but overall cooperative',
+        'expected_outcome': 'PASS (with minor flags)',
+        'duration': '6-8 minutes',
+        'customer_behavior': 'Mostly cooperative, slight hesitation on 1-2 questions, minor tech issues',
+        'special_instructions': 'Include slight camera adjustment or brief pause mid-call'
+    },
+    {
+        'id': 'case3',
+        'name': 'Case 3: Suspicious Behavior',
+        'description': 'Customer shows red flags but doesn\'t fail outright',
+        'expected_outcome': 'FLAG for manual review',
+        'duration': '7-10 minutes',
+        'customer_behavior': 'Defensive, asks "why do you need this?", interrupts agent, evasive',
+        'special_instructions': 'Customer should be subtly suspicious, not over-the-top'
+    },
+    {
+        'id': 'case4',
+        'name': 'Case 4: Fake Video / Replay',
+        'description': 'Pre-recorded video played back on screen',
+        'expected_outcome': 'REJECT (Liveness failed)',
+        'duration': '5-7 minutes',
+        'customer_behavior': 'Video responses don\'t match questions, screen patterns visible',
+        'special_instructions': 'Record genuine video first, then replay it on another screen and film that'
+    },
+    {
+        'id': 'case5',
+        'name': 'Case 5: Non-Compliant Documents',
+        'description': 'Unmasked Aadhaar or refuses to show documents',
+        'expected_outcome': 'REJECT (Document verification failed)',
+        'duration': '3-5 minutes',
+        'customer_behavior': 'Shows unmasked Aadhaar (not redacted) OR refuses to show PAN',
+        'special_instructions': 'Show Aadhaar without masking number OR refuse to show documents'
+    },
+    {
+        'id': 'case6',
+        'name': 'Case 6: Not Attending Independently',
+        'description': 'Customer not in India OR someone is assisting them',
+        'expected_outcome': 'REJECT (Critical compliance failure)',
+        'duration': '1-3 minutes',
+        'customer_behavior': 'Says they are not in India OR someone is helping/prompting them',
+        'special_instructions': 'Customer answers "No" to India presence or independence questions'
+    }
+]
+
+_CASE_TEMPLATES_BODY = orjson.dumps(CASE_TEMPLATES)
+_CASE_TEMPLATES_ETAG = hashlib.sha1(_CASE_TEMPLATES_BODY).hexdigest()
+
+
 @app.route('/api/get-script')
 def get_script():
     """API endpoint to get KYC script"""
+    global _SCRIPT_CACHE
     try:
-        with open('data/scripts/rbi_kyc_script.json', 'r', encoding='utf-8') as f:
-            script_data = json.load(f)
-        return jsonify(script_data)
+        mtime = os.stat(SCRIPT_PATH).st_mtime_ns
+        cached = _SCRIPT_CACHE
+        if cached is None or cached[0] != mtime:
+            with open(SCRIPT_PATH, 'rb') as f:
+                body = f.read()
+            orjson.loads(body)  # Validate before caching
+            cached = _SCRIPT_CACHE = (mtime, body)
+        return app.response_class(cached[1], mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -78,63 +391,11 @@ def get_script():
 @app.route('/api/get-case-templates')
 def get_case_templates():
     """Get recording case templates"""
-    cases = [
-        {
-            'id': 'case1',
-            'name': 'Case 1: Genuine - Approval',
-            'description': 'Everything goes smoothly, customer cooperates fully',
-            'expected_outcome': 'PASS',
-            'duration': '5-7 minutes',
-            'customer_behavior': 'Cooperative, answers all questions clearly, shows documents properly',
-            'special_instructions': 'Follow script exactly, customer should be natural and professional'
-        },
-        {
-            'id': 'case2',
-            'name': 'Case 2: Genuine with Minor Issues',
-            'description': 'Minor hesitation or technical issues but overall cooperative',
-            'expected_outcome': 'PASS (with minor flags)',
-            'duration': '6-8 minutes',
-            'customer_behavior': 'Mostly cooperative, slight hesitation on 1-2 questions, minor tech issues',
-            'special_instructions': 'Include slight camera adjustment or brief pause mid-call'
-        },
-        {
-            'id': 'case3',
-            'name': 'Case 3: Suspicious Behavior',
-            'description': 'Customer shows red flags but doesn\'t fail outright',
-            'expected_outcome': 'FLAG for manual review',
-            'duration': '7-10 minutes',
-            'customer_behavior': 'Defensive, asks "why do you need this?", interrupts agent, evasive',
-            'special_instructions': 'Customer should be subtly suspicious, not over-the-top'
-        },
-        {
-            'id': 'case4',
-            'name': 'Case 4: Fake Video / Replay',
-            'description': 'Pre-recorded video played back on screen',
-            'expected_outcome': 'REJECT (Liveness failed)',
-            'duration': '5-7 minutes',
-            'customer_behavior': 'Video responses don\'t match questions, screen patterns visible',
-            'special_instructions': 'Record genuine video first, then replay it on another screen and film that'
-        },
-        {
-            'id': 'case5',
-            'name': 'Case 5: Non-Compliant Documents',
-            'description': 'Unmasked Aadhaar or refuses to show documents',
-            'expected_outcome': 'REJECT (Document verification failed)',
-            'duration': '3-5 minutes',
-            'customer_behavior': 'Shows unmasked Aadhaar (not redacted) OR refuses to show PAN',
-            'special_instructions': 'Show Aadhaar without masking number OR refuse to show documents'
-        },
-        {
-            'id': 'case6',
-            'name': 'Case 6: Not Attending Independently',
-            'description': 'Customer not in India OR someone is assisting them',
-            'expected_outcome': 'REJECT (Critical compliance failure)',
-            'duration': '1-3 minutes',
-            'customer_behavior': 'Says they are not in India OR someone is helping/prompting them',
-            'special_instructions': 'Customer answers "No" to India presence or independence questions'
-        }
-    ]
-    return jsonify(cases)
+    response = app.response_class(_CASE_TEMPLATES_BODY, mimetype='application/json')
+    response.set_etag(_CASE_TEMPLATES_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
 
 
 @app.route('/api/save-metadata', methods=['POST'])
@@ -149,8 +410,8 @@ def save_metadata():
 
         filepath = os.path.join('data/videos', filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
 
         return jsonify({'success': True, 'file': filename})
     except Exception as e:
@@ -161,8 +422,6 @@ def save_metadata():
 def save_captures():
     """Save captured document images (PAN/Aadhaar)"""
     try:
-        import base64
-
         data = request.json
         images = data.get('images', [])
         timestamp = data.get('timestamp', datetime.now().timestamp())
@@ -172,6 +431,7 @@ def save_captures():
         os.makedirs(captures_folder, exist_ok=True)
 
         saved_files = []
+        pending_writes = []
 
         for img in images:
             img_type = img.get('type', 'unknown')
@@ -181,27 +441,26 @@ def save_captures():
             if not img_data:
                 continue
 
-            # Remove data URL prefix (data:image/png;base64,)
-            if ',' in img_data:
-                img_data = img_data.split(',')[1]
+            # Skip data URL prefix (data:image/png;base64,) without splitting
+            payload_start = img_data.find(',') + 1
 
-            # Decode base64
-            img_bytes = base64.b64decode(img_data)
+            # Decode base64 (into a bytearray when pybase64 is available)
+            img_bytes = b64decode_buffer(img_data[payload_start:], validate=False)
 
             # Create filename
             filename = f"{img_type}_{img_timestamp}.png"
             filepath = os.path.join(captures_folder, filename)
 
-            # Save image
-            with open(filepath, 'wb') as f:
-                f.write(img_bytes)
-
+            pending_writes.append((filepath, img_bytes))
             saved_files.append(filename)
-            print(f"Saved captured image: {filename}")
+
+        # Save images concurrently; list() re-raises any write error
+        if pending_writes:
+            list(_CAPTURE_WRITE_POOL.map(lambda job: write_bytes(*job), pending_writes))
 
         return jsonify({'success': True, 'files': saved_files})
     except Exception as e:
-        print(f"Error saving captures: {e}")
+        app.logger.error("Error saving captures: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -224,7 +483,7 @@ def upload_video():
 
         # Save video
         filename = video.filename
-        video.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+        stream_upload(video, os.path.join(app.config['UPLOAD_FOLDER'], filename))
 
         # Handle document uploads if provided
         documents = []
@@ -233,7 +492,7 @@ def upload_video():
                 doc = request.files[key]
                 if doc.filename:
                     doc_path = os.path.join(app.config['DOCUMENTS_FOLDER'], doc.filename)
-                    doc.save(doc_path)
+                    stream_upload(doc, doc_path)
                     documents.append(doc.filename)
 
         return jsonify({
@@ -249,8 +508,6 @@ def upload_video():
 def convert_to_mp4():
     """Convert uploaded WebM video to MP4"""
     try:
-        import subprocess
-
         if 'video' not in request.files:
             return jsonify({'error': 'No video file provided'}), 400
 
@@ -261,25 +518,43 @@ def convert_to_mp4():
         # Save the WebM file temporarily
         webm_filename = video.filename
         webm_path = os.path.join(app.config['UPLOAD_FOLDER'], webm_filename)
-        video.save(webm_path)
+        stream_upload(video, webm_path)
 
         # Create MP4 filename
         mp4_filename = webm_filename.replace('.webm', '.mp4')
         mp4_path = os.path.join(app.config['UPLOAD_FOLDER'], mp4_filename)
 
-        # Convert using FFmpeg
-        try:
-            subprocess.run([
-                'ffmpeg', '-i', webm_path,
+        # Streams that are already MP4-compatible are copied instead of re-encoded
+        video_codec, audio_codec = probe_codecs(webm_path)
+
+        if video_codec == 'h264':
+            video_args = ['-c:v', 'copy']  # Remux H.264 as-is
+        else:
+            video_args = [
                 '-c:v', 'libx264',  # H.264 video codec
                 '-preset', 'fast',   # Fast encoding
                 '-crf', '23',        # Quality (lower = better, 23 is good)
+                '-threads', '0'      # Use all cores
+            ]
+
+        if audio_codec == 'aac':
+            audio_args = ['-c:a', 'copy']
+        else:
+            audio_args = [
                 '-c:a', 'aac',       # AAC audio codec
-                '-b:a', '128k',      # Audio bitrate
-                '-movflags', '+faststart',  # Enable streaming
-                '-y',                # Overwrite output file
-                mp4_path
-            ], check=True, capture_output=True)
+                '-b:a', '128k'       # Audio bitrate
+            ]
+
+        # Convert using FFmpeg
+        try:
+            subprocess.run(
+                ['ffmpeg', '-i', webm_path] + video_args + audio_args + [
+                    '-movflags', '+faststart',  # Enable streaming
+                    '-y',                # Overwrite output file
+                    mp4_path
+                ],
+                check=True, capture_output=True
+            )
 
             # Remove the WebM file after successful conversion
             os.remove(webm_path)
@@ -306,7 +581,10 @@ def convert_to_mp4():
 def download_converted(filename):
     """Download converted MP4 file"""
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
+        return send_from_directory(
+            app.config['UPLOAD_FOLDER'], filename, as_attachment=True,
+            conditional=True, etag=True, max_age=OUTPUT_MAX_AGE
+        )
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -324,31 +602,37 @@ def list_videos():
         videos = []
         video_extensions = ('.mp4', '.webm', '.avi', '.mov')
 
-        for filename in os.listdir(app.config['UPLOAD_FOLDER']):
-            if filename.lower().endswith(video_extensions):
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                base_name = os.path.splitext(filename)[0]
-                metadata_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{base_name}.json")
+        # One directory pass: dirent + stat per entry, metadata sidecars by name
+        with os.scandir(app.config['UPLOAD_FOLDER']) as it:
+            entries = list(it)
+        metadata_bases = {e.name[:-5] for e in entries if e.name.endswith('.json')}
+
+        for entry in entries:
+            if entry.name.lower().endswith(video_extensions):
+                st = entry.stat(follow_symlinks=False)
+                base_name = os.path.splitext(entry.name)[0]
+                has_metadata = base_name in metadata_bases
 
                 video_info = {
-                    'filename': filename,
-                    'size': os.path.getsize(filepath),
-                    'size_mb': round(os.path.getsize(filepath) / (1024 * 1024), 2),
-                    'uploaded': datetime.fromtimestamp(os.path.getctime(filepath)).isoformat(),
-                    'has_metadata': os.path.exists(metadata_path)
+                    'filename': entry.name,
+                    'size': st.st_size,
+                    'size_mb': round(st.st_size / (1024 * 1024), 2),
+                    'uploaded': format_timestamp(st.st_ctime),
+                    'has_metadata': has_metadata
                 }
 
                 # Load metadata if exists
-                if os.path.exists(metadata_path):
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        video_info['metadata'] = json.load(f)
+                if has_metadata:
+                    metadata_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{base_name}.json")
+                    with open(metadata_path, 'rb') as f:
+                        video_info['metadata'] = orjson.loads(f.read())
 
-                videos.append(video_info)
+                videos.append((st.st_ctime, video_info))
 
         # Sort by upload time (newest first)
-        videos.sort(key=lambda x: x['uploaded'], reverse=True)
+        videos.sort(key=lambda x: x[0], reverse=True)
 
-        return jsonify(videos)
+        return json_response([video_info for _, video_info in videos])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -361,17 +645,18 @@ def list_documents():
         image_extensions = ('.jpg', '.jpeg', '.png', '.gif')
 
         if os.path.exists(app.config['DOCUMENTS_FOLDER']):
-            for filename in os.listdir(app.config['DOCUMENTS_FOLDER']):
-                if filename.lower().endswith(image_extensions):
-                    filepath = os.path.join(app.config['DOCUMENTS_FOLDER'], filename)
-                    documents.append({
-                        'filename': filename,
-                        'size': os.path.getsize(filepath),
-                        'uploaded': datetime.fromtimestamp(os.path.getctime(filepath)).isoformat()
-                    })
-
-        documents.sort(key=lambda x: x['uploaded'], reverse=True)
-        return jsonify(documents)
+            with os.scandir(app.config['DOCUMENTS_FOLDER']) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(image_extensions):
+                        st = entry.stat(follow_symlinks=False)
+                        documents.append((st.st_ctime, {
+                            'filename': entry.name,
+                            'size': st.st_size,
+                            'uploaded': format_timestamp(st.st_ctime)
+                        }))
+
+        documents.sort(key=lambda x: x[0], reverse=True)
+        return json_response([doc for _, doc in documents])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -393,33 +678,24 @@ def analyze_video():
         if not os.path.exists(video_path):
             return jsonify({'error': f'Video not found: {video_filename}'}), 404
 
-        # Create analysis ID
-        analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.splitext(video_filename)[0]}"
+        allowed_models = allowed_whisper_models()
+        if whisper_model not in allowed_models:
+            return jsonify({
+                'error': f"Whisper model '{whisper_model}' not allowed here. "
+                         f"Choose one of: {', '.join(sorted(allowed_models))}"
+            }), 400
 
-        # Initialize status and save to file
-        status_data = {
-            'status': 'starting',
-            'progress': 0,
-            'stage': 'Initializing...',
-            'video_filename': video_filename,
-            'started_at': datetime.now().isoformat()
-        }
-        save_status(analysis_id, status_data)
+        # Reserve an analysis slot (released when the background run ends)
+        if not _ANALYSIS_SLOTS.acquire(blocking=False):
+            return jsonify({
+                'error': 'Too many analyses running, please retry shortly'
+            }), 429, {'Retry-After': '30'}
 
-        # Reference image path
-        reference_path = None
-        if reference_image:
-            reference_path = os.path.join(app.config['DOCUMENTS_FOLDER'], reference_image)
-            if not os.path.exists(reference_path):
-                reference_path = None
-
-        # Start analysis in background thread
-        thread = threading.Thread(
-            target=run_analysis_background,
-            args=(analysis_id, video_path, reference_path, whisper_model)
-        )
-        thread.daemon = True
-        thread.start()
+        try:
+            analysis_id = start_analysis(video_filename, video_path, reference_image, whisper_model)
+        except Exception:
+            _ANALYSIS_SLOTS.release()
+            raise
 
         return jsonify({
             'success': True,
@@ -431,6 +707,39 @@ def analyze_video():
         return jsonify({'error': str(e)}), 500
 
 
+def start_analysis(video_filename, video_path, reference_image, whisper_model):
+    """Create the status file and launch the background analysis thread"""
+    # Create analysis ID
+    analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.splitext(video_filename)[0]}"
+
+    # Initialize status and save to file
+    status_data = {
+        'status': 'starting',
+        'progress': 0,
+        'stage': 'Initializing...',
+        'video_filename': video_filename,
+        'started_at': datetime.now().isoformat()
+    }
+    save_status(analysis_id, status_data)
+
+    # Reference image path
+    reference_path = None
+    if reference_image:
+        reference_path = os.path.join(app.config['DOCUMENTS_FOLDER'], reference_image)
+        if not os.path.exists(reference_path):
+            reference_path = None
+
+    # Start analysis in background thread
+    thread = threading.Thread(
+        target=run_analysis_in_slot,
+        args=(analysis_id, video_path, reference_path, whisper_model)
+    )
+    thread.daemon = True
+    thread.start()
+
+    return analysis_id
+
+
 @app.route('/api/analysis-status/<analysis_id>')
 def get_analysis_status(analysis_id):
     """Get status of running analysis"""
@@ -438,27 +747,17 @@ def get_analysis_status(analysis_id):
     if not status_data:
         return jsonify({'error': 'Analysis not found'}), 404
 
-    return jsonify(status_data)
+    return json_response(status_data)
 
 
 @app.route('/api/analysis-result/<analysis_id>')
 def get_analysis_result(analysis_id):
     """Get completed analysis result"""
-    status_data = load_status(analysis_id)
-    if not status_data:
-        return jsonify({'error': 'Analysis not found'}), 404
+    result_path, error, status_code = get_completed_result_path(analysis_id)
+    if not result_path:
+        return jsonify({'error': error}), status_code
 
-    if status_data['status'] != 'completed':
-        return jsonify({'error': 'Analysis not completed yet'}), 400
-
-    # Load result from file
-    result_path = status_data.get('result_path')
-    if result_path and os.path.exists(result_path):
-        with open(result_path, 'r', encoding='utf-8') as f:
-            result = json.load(f)
-        return jsonify(result)
-    else:
-        return jsonify({'error': 'Result file not found'}), 404
+    return json_file_response(result_path)
 
 
 @app.route('/results/<analysis_id>')
@@ -478,24 +777,12 @@ def view_results(analysis_id):
 def get_results(analysis_id):
     """Get analysis results as JSON"""
     try:
-        # Load status to get the result path
-        status_data = load_status(analysis_id)
-        if not status_data:
-            return jsonify({'error': 'Analysis not found'}), 404
-
-        if status_data['status'] != 'completed':
-            return jsonify({'error': 'Analysis not completed yet'}), 400
-
-        # Get the result path from status
-        result_path = status_data.get('result_path')
-        if not result_path or not os.path.exists(result_path):
-            return jsonify({'error': 'Results file not found'}), 404
+        result_path, error, status_code = get_completed_result_path(analysis_id)
+        if not result_path:
+            return jsonify({'error': error}), status_code
 
-        # Read the JSON report
-        with open(result_path, 'r', encoding='utf-8') as f:
-            results = json.load(f)
-
-        return jsonify(results)
+        # Serve the JSON report straight from disk
+        return json_file_response(result_path)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -505,29 +792,129 @@ def get_results(analysis_id):
 def download_report(analysis_id):
     """Download the full JSON report"""
     try:
-        # Load status to get the result path
-        status_data = load_status(analysis_id)
-        if not status_data:
-            return jsonify({'error': 'Analysis not found'}), 404
-
-        if status_data['status'] != 'completed':
-            return jsonify({'error': 'Analysis not completed yet'}), 400
-
-        # Get the result path from status
-        result_path = status_data.get('result_path')
-        if not result_path or not os.path.exists(result_path):
-            return jsonify({'error': 'Results file not found'}), 404
+        result_path, error, status_code = get_completed_result_path(analysis_id)
+        if not result_path:
+            return jsonify({'error': error}), status_code
 
         # Get directory and filename
         directory = os.path.dirname(result_path)
         filename = os.path.basename(result_path)
 
-        return send_from_directory(directory, filename, as_attachment=True)
+        return send_from_directory(directory, filename, as_attachment=True, conditional=True)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+class StatusFlusher:
+    """
+    Coalesces progress updates for one analysis into periodic status writes.
+    Only the latest update is kept; a daemon thread persists it every interval.
+    """
+
+    def __init__(self, analysis_id, interval=0.1):
+        self.analysis_id = analysis_id
+        self.interval = interval
+        self._pending = None
+        self._last_written = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def update(self, status_data):
+        """Queue a status snapshot, replacing any not yet written"""
+        with self._lock:
+            self._pending = dict(status_data)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            return
+
+        # Skip if nothing visible changed since the last write. The flusher
+        # already limits the write rate, so save_status must not throttle it
+        # again (a dropped write would be recorded here as written).
+        marker = (pending.get('progress'), pending.get('stage'))
+        if marker != self._last_written:
+            save_status(self.analysis_id, pending, force=True)
+            self._last_written = marker
+
+    def close(self):
+        """Stop the flusher and persist whatever is still pending"""
+        self._stop.set()
+        self._thread.join()
+        self._flush()
+
+
+# Whisper models clients may request; the large ones need a GPU to be usable
+WHISPER_MODELS_CPU = frozenset({'tiny', 'base', 'small'})
+WHISPER_MODELS_GPU = WHISPER_MODELS_CPU | {'medium', 'large', 'large-v2', 'large-v3'}
+
+# Analyses allowed to run at once; further requests get 429 and retry later
+MAX_CONCURRENT_ANALYSES = int(os.environ.get('MAX_CONCURRENT_ANALYSES', 2))
+_ANALYSIS_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_ANALYSES)
+
+
+@functools.lru_cache(maxsize=1)
+def allowed_whisper_models():
+    """Whisper models allowed on this machine (checks for CUDA once)"""
+    try:
+        import torch
+        has_gpu = torch.cuda.is_available()
+    except ImportError:
+        has_gpu = False
+    return WHISPER_MODELS_GPU if has_gpu else WHISPER_MODELS_CPU
+
+
+# Analyzers are expensive to build (models, cascades), so keep one per Whisper
+# model and reuse it. Each entry carries a lock because analyze() keeps
+# per-run state on the instance and is not re-entrant.
+_ANALYZER_POOL = {}  # whisper model -> (VideoAnalyzer, threading.Lock)
+_ANALYZER_POOL_LOCK = threading.Lock()
+_ANALYZER_BUILD_LOCKS = {}  # whisper model -> lock held while its analyzer is built
+
+
+def get_analyzer(whisper_model):
+    """Get the shared analyzer (and its run lock) for a Whisper model"""
+    with _ANALYZER_POOL_LOCK:
+        entry = _ANALYZER_POOL.get(whisper_model)
+        if entry is not None:
+            return entry
+        build_lock = _ANALYZER_BUILD_LOCKS.setdefault(whisper_model, threading.Lock())
+
+    # Loading a model can take minutes, so build outside the pool lock; only
+    # requests for this same model wait on the build
+    with build_lock:
+        with _ANALYZER_POOL_LOCK:
+            entry = _ANALYZER_POOL.get(whisper_model)
+        if entry is None:
+            # Import analyzer (lazy load to avoid startup delay)
+            from modules.video_analyzer import VideoAnalyzer
+
+            analyzer = VideoAnalyzer(
+                output_base_dir=app.config['ANALYSIS_FOLDER'],
+                whisper_model=whisper_model
+            )
+            entry = (analyzer, threading.Lock())
+            with _ANALYZER_POOL_LOCK:
+                _ANALYZER_POOL[whisper_model] = entry
+    return entry
+
+
+def run_analysis_in_slot(*args):
+    """Run the analysis, then give its concurrency slot back"""
+    try:
+        run_analysis_background(*args)
+    finally:
+        _ANALYSIS_SLOTS.release()
+
+
 def run_analysis_background(analysis_id, video_path, reference_path, whisper_model):
     """Run video analysis in background thread"""
     try:
@@ -540,34 +927,38 @@ def run_analysis_background(analysis_id, video_path, reference_path, whisper_mod
         status_data['stage'] = 'Loading analysis modules...'
         save_status(analysis_id, status_data)
 
-        # Import analyzer (lazy load to avoid startup delay)
-        from modules.video_analyzer import VideoAnalyzer
-
         status_data['progress'] = 20
         status_data['stage'] = 'Initializing analyzer...'
         save_status(analysis_id, status_data)
 
-        # Create analyzer
-        analyzer = VideoAnalyzer(output_base_dir=app.config['ANALYSIS_FOLDER'])
+        # Reuse the pooled analyzer for this model (built on first use)
+        analyzer, analyzer_lock = get_analyzer(whisper_model)
 
         status_data['progress'] = 30
         status_data['stage'] = 'Starting analysis pipeline...'
         save_status(analysis_id, status_data)
 
-        # Progress callback - saves to file each time
+        # Progress callback - coalesced into at most ~10 writes/sec
+        flusher = StatusFlusher(analysis_id)
+
         def update_progress(progress, stage):
             status_data['progress'] = progress
             status_data['stage'] = stage
-            save_status(analysis_id, status_data)
+            flusher.update(status_data)
             print(f"[{analysis_id}] {progress}% - {stage}")
 
         # Run analysis with progress callback
-        results = analyzer.analyze(
-            video_path=video_path,
-            reference_face_path=reference_path,
-            whisper_model=whisper_model,
-            progress_callback=update_progress
-        )
+        try:
+            with analyzer_lock:
+                results = analyzer.analyze(
+                    video_path=video_path,
+                    reference_face_path=reference_path,
+                    whisper_model=whisper_model,
+                    progress_callback=update_progress
+                )
+        finally:
+            # Drain before any terminal write so a stale update can't overwrite it
+            flusher.close()
 
         status_data['progress'] = 100
         status_data['status'] = 'completed'
@@ -591,6 +982,13 @@ def run_analysis_background(analysis_id, video_path, reference_path, whisper_mod
         # Save final status
         save_status(analysis_id, status_data)
 
+        # Warm the result cache so the results page doesn't wait on disk
+        if status_data['result_path']:
+            try:
+                load_result_bytes(status_data['result_path'])
+            except OSError:
+                pass
+
     except Exception as e:
         # Load status and update with error
         status_data = load_status(analysis_id) or {}
@@ -607,7 +1005,10 @@ def run_analysis_background(analysis_id, video_path, reference_path, whisper_mod
 @app.route('/outputs/analysis/<path:filename>')
 def serve_analysis_output(filename):
     """Serve analysis output files (HTML reports, images, etc.)"""
-    return send_from_directory(app.config['ANALYSIS_FOLDER'], filename)
+    return send_from_directory(
+        app.config['ANALYSIS_FOLDER'], filename,
+        conditional=True, etag=True, max_age=OUTPUT_MAX_AGE
+    )
 
 
 if __name__ == '__main__':
@@ -623,6 +1024,10 @@ if __name__ == '__main__':
     print("  - /analyze            : Analyze videos with AI")
     print("\n" + "="*60 + "\n")
 
+    # Warm the default analyzer in the background so the first request
+    # doesn't pay the model loading cost
+    threading.Thread(target=get_analyzer, args=('base',), daemon=True).start()
+
     # IMPORTANT: Disable auto-reload to prevent analysis interruption
     # Auto-reload kills background analysis threads when it detects file changes
     app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
@@ -3,12 +3,13 @@ Video KYC Decision Engine
 """
 
 from .decision_engine import DecisionEngine, Decision, make_kyc_decision
-from .report_generator import ReportGenerator, generate_report
+from .report_generator import ReportGenerator, generate_report, generate_reports_batch
 
 __all__ = [
     'DecisionEngine',
     'Decision',
     'make_kyc_decision',
     'ReportGenerator',
-    'generate_report'
+    'generate_report',
+    'generate_reports_batch'
 ]
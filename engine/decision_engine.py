@@ -3,10 +3,84 @@ Decision Engine
 Aggregates all module scores and makes final PASS/REJECT/FLAG decision
 """
 
+import logging
 import os
-import json
+import threading
+import time
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# Shared stand-in for missing sub-results (read-only, never mutate)
+_EMPTY = {}
+
+# Per-thread cache of the ISO-formatted current second
+_iso_cache = threading.local()
+
+# Marks absent fields in decision cache keys (distinct from an explicit None)
+_MISSING = object()
+
+
+# numba is imported on the first batch call, not with this module, so single
+# decisions don't pay for it. Rebound to numba.prange at that point.
+prange = range
+
+# Batch scorer picked on first use (see _batch_weighted_scores)
+_batch_scorer = None
+
+
+def _batch_kernel(scores, present, weights):
+    """Weighted score per row of an (N, modules) matrix, over the present scores (numba kernel)"""
+    out = np.empty(scores.shape[0])
+    for i in prange(scores.shape[0]):
+        total_score = 0.0
+        total_weight = 0.0
+        for j in range(scores.shape[1]):
+            if present[i, j]:
+                total_score += scores[i, j] * weights[j]
+                total_weight += weights[j]
+        if total_weight > 0 and total_weight < 1:
+            total_score = total_score / total_weight
+        out[i] = total_score
+    return out
+
+
+def _numpy_batch_weighted_scores(scores, present, weights):
+    """Weighted score per row of an (N, modules) matrix, over the present scores"""
+    total_score = np.where(present, scores, 0.0) @ weights
+    total_weight = present @ weights
+    partial = (total_weight > 0) & (total_weight < 1)
+    return np.where(partial, total_score / np.where(partial, total_weight, 1.0), total_score)
+
+
+def _batch_weighted_scores(scores, present, weights):
+    """Weighted scores for a batch, compiled with numba when it is installed"""
+    global _batch_scorer, prange
+    if _batch_scorer is None:
+        try:
+            import numba
+        except ImportError:
+            _batch_scorer = _numpy_batch_weighted_scores
+        else:
+            prange = numba.prange
+            _batch_scorer = numba.njit(parallel=True, cache=True)(_batch_kernel)
+    return _batch_scorer(scores, present, weights)
 
 
 class Decision(Enum):
@@ -22,29 +96,97 @@ class DecisionEngine:
     Combines all module scores and applies business rules.
     """
 
-    def __init__(self):
-        """Initialize decision engine with scoring weights and thresholds"""
-        print("Initializing Decision Engine...")
+    __slots__ = (
+        'weights', 'thresholds', 'instant_reject_rules', 'instant_flag_rules',
+        '_weight_keys', '_weight_vec', '_rec_indices', '_result_template', '_threshold_templates',
+        'cache_size', '_decision_cache', '_decision_cache_lock'
+    )
+
+    # Decision members and their string values, bound once to skip Enum lookups
+    _PASS = Decision.PASS
+    _FLAG = Decision.FLAG
+    _REJECT = Decision.REJECT
+    _PASS_VAL = Decision.PASS.value
+    _FLAG_VAL = Decision.FLAG.value
+    _REJECT_VAL = Decision.REJECT.value
+
+    # Missing critical script items -> instant reject reason
+    _KEYWORD_REASONS = (
+        ('india', 'Customer not confirmed in India'),
+        ('independent', 'Customer not attending independently')
+    )
+
+    # Per-module recommendation when its score falls below 60
+    _REC_TABLE = (
+        ('liveness', 'Low liveness score',
+         'Verify video is not a replay. Check for natural blinks and movements.'),
+        ('face_match', 'Face match failed',
+         'Manually verify face against document. Consider re-recording with better lighting.'),
+        ('script_compliance', 'Script not followed completely',
+         'Review transcript for missing mandatory questions.'),
+        ('behavior', 'Suspicious behavior detected',
+         'Review flagged segments for evasion or resistance patterns.')
+    )
+
+    def __init__(self, cache_size=0):
+        """
+        Initialize decision engine with scoring weights and thresholds
+
+        Args:
+            cache_size: Number of decisions to memoize by their scoring inputs (0 disables)
+        """
+        logger.debug("Initializing Decision Engine...")
 
-        # Module weights (must sum to 1.0)
-        self.weights = {
+        # Module weights (must sum to 1.0), read-only once built
+        self.weights = MappingProxyType({
             'liveness': 0.25,          # 25% - RBI mandatory
             'face_match': 0.25,        # 25% - RBI mandatory
             'script_compliance': 0.20, # 20% - Important for compliance
             'document_verification': 0.15,  # 15% - Document checks
             'behavior': 0.10,          # 10% - Suspicious behavior
             'consent': 0.05            # 5% - Consent verification
-        }
+        })
+
+        # Weight vector in a fixed module order for vectorized scoring
+        self._weight_keys = tuple(self.weights)
+        self._weight_vec = np.asarray(list(self.weights.values()), dtype=np.float64)
+        self._rec_indices = np.array([self._weight_keys.index(rec[0]) for rec in self._REC_TABLE])
 
-        # Thresholds for decisions
-        self.thresholds = {
+        # Thresholds for decisions, read-only once built
+        self.thresholds = MappingProxyType({
             'pass': 75,      # Score >= 75 -> PASS
             'flag': 50,      # Score 50-74 -> FLAG
             'reject': 50     # Score < 50 -> REJECT
+        })
+
+        # Result skeleton in output key order; decisions copy it and fill the per-call fields
+        self._result_template = {
+            'decision': None,
+            'final_score': None,
+            'decision_reason': None,
+            'override_applied': False,
+            'override_reasons': None,
+            'module_scores': None,
+            'module_passed': None,
+            # Plain-dict snapshots shared by every result (proxies aren't JSON serializable)
+            'thresholds': dict(self.thresholds),
+            'weights': dict(self.weights),
+            'timestamp': None,
+            'recommendations': None
         }
 
+        # Pre-filled skeletons for the PASS / FLAG / REJECT threshold outcomes
+        self._threshold_templates = tuple(
+            {**self._result_template, 'decision': value, 'decision_reason': reason}
+            for value, reason in (
+                (self._PASS_VAL, "All checks passed with sufficient score"),
+                (self._FLAG_VAL, "Score below pass threshold, requires manual review"),
+                (self._REJECT_VAL, "Score too low, verification failed")
+            )
+        )
+
         # Instant reject conditions (bypass scoring)
-        self.instant_reject_rules = [
+        self.instant_reject_rules = frozenset({
             'liveness_failed',
             'face_mismatch',
             'no_consent',
@@ -52,43 +194,59 @@ class DecisionEngine:
             'not_independent',
             'aadhaar_not_masked',
             'critical_behavior_flag'
-        ]
+        })
 
         # Instant flag conditions
-        self.instant_flag_rules = [
+        self.instant_flag_rules = frozenset({
             'high_behavior_risk',
             'multiple_hesitations',
             'script_incomplete'
-        ]
+        })
+
+        # Opt-in memo of decisions keyed on the inputs that affect them
+        self.cache_size = cache_size
+        self._decision_cache = {}
+        self._decision_cache_lock = threading.Lock()
 
-        print(f"  Weights: {self.weights}")
-        print(f"  Pass threshold: {self.thresholds['pass']}")
-        print("  Decision engine initialized")
+        logger.debug("  Weights: %s", self.weights)
+        logger.debug("  Pass threshold: %s", self.thresholds['pass'])
+        logger.debug("  Decision engine initialized")
 
-    def calculate_weighted_score(self, module_scores):
+    def calculate_weighted_score(self, module_scores, return_scores=False):
         """
         Calculate weighted average score from all modules
 
         Args:
             module_scores: Dictionary of module name -> score (0-100)
+            return_scores: Also return the per-module score vector (in _weight_keys order)
 
         Returns:
-            Weighted average score
+            Weighted average score, or (score, score vector) if return_scores is set
         """
-        total_score = 0
-        total_weight = 0
-
-        for module, weight in self.weights.items():
-            if module in module_scores:
-                score = module_scores[module]
-                if score is not None:
-                    total_score += score * weight
-                    total_weight += weight
+        # Missing/None scores are masked out of the sum (stored as NaN). A score
+        # that is itself NaN stays in, so a broken module can't drop out of the
+        # decision and leave the others to pass it.
+        present = np.fromiter(
+            (module_scores.get(k) is not None for k in self._weight_keys),
+            dtype=bool,
+            count=len(self._weight_keys)
+        )
+        scores = np.fromiter(
+            (module_scores[k] if is_present else np.nan for k, is_present in zip(self._weight_keys, present)),
+            dtype=np.float64,
+            count=len(self._weight_keys)
+        )
+        weights = self._weight_vec[present]
+
+        total_score = float(np.dot(scores[present], weights))
+        total_weight = float(weights.sum())
 
         # Normalize if not all modules present
         if total_weight > 0 and total_weight < 1:
             total_score = total_score / total_weight
 
+        if return_scores:
+            return round(total_score, 2), scores
         return round(total_score, 2)
 
     def check_instant_conditions(self, module_results):
@@ -105,45 +263,49 @@ class DecisionEngine:
         instant_flag_reasons = []
 
         # Check liveness
-        liveness = module_results.get('liveness', {})
+        liveness = module_results.get('liveness') or _EMPTY
         if liveness.get('liveness_score', 100) < 50:
             instant_reject_reasons.append('Liveness check failed - possible replay attack')
         if not liveness.get('is_live', True):
             instant_reject_reasons.append('Video is not live')
 
         # Check face match
-        face_match = module_results.get('face_match', {})
+        face_match = module_results.get('face_match') or _EMPTY
         if face_match.get('score', 100) < 50:
             instant_reject_reasons.append('Face does not match document')
         if face_match.get('confidence', 'HIGH') == 'LOW':
             instant_flag_reasons.append('Low confidence in face match')
 
         # Check script compliance for critical items
-        script = module_results.get('script_compliance', {})
-        if script.get('script_compliance', {}).get('critical_failures', 0) > 0:
-            missing = script.get('script_compliance', {}).get('missing_critical', [])
+        script = (module_results.get('script_compliance') or _EMPTY).get('script_compliance') or _EMPTY
+        if script.get('critical_failures', 0) > 0:
+            missing = script.get('missing_critical', ())
             for item in missing:
-                if 'india' in item.get('expected_text', '').lower():
-                    instant_reject_reasons.append('Customer not confirmed in India')
-                if 'independent' in item.get('expected_text', '').lower():
-                    instant_reject_reasons.append('Customer not attending independently')
+                text = item.get('expected_text', '')
+                if not text:
+                    continue
+                lowered = text.lower()
+                for keyword, reason in self._KEYWORD_REASONS:
+                    if keyword in lowered:
+                        instant_reject_reasons.append(reason)
 
         # Check behavior
-        behavior = module_results.get('behavior', {})
+        behavior = module_results.get('behavior') or _EMPTY
         if behavior.get('risk_level', 'LOW') == 'HIGH':
             instant_flag_reasons.append('High risk behavior detected')
-        if len(behavior.get('behavior_analysis', {}).get('critical_flags', [])) > 0:
+        behavior_analysis = behavior.get('behavior_analysis') or _EMPTY
+        if behavior_analysis.get('critical_flags'):
             instant_reject_reasons.append('Critical suspicious behavior detected')
 
         # Determine override
         if instant_reject_reasons:
-            return Decision.REJECT, instant_reject_reasons
+            return self._REJECT, instant_reject_reasons
         elif instant_flag_reasons:
-            return Decision.FLAG, instant_flag_reasons
+            return self._FLAG, instant_flag_reasons
         else:
             return None, []
 
-    def make_decision(self, module_results):
+    def make_decision(self, module_results, now=None):
         """
         Make final KYC decision based on all module results
 
@@ -151,16 +313,123 @@ class DecisionEngine:
             module_results: Dictionary containing results from all modules
                 Expected keys: liveness, face_match, script_compliance,
                               document_verification, behavior, consent
+            now: Optional datetime to stamp the result with (defaults to current time)
 
         Returns:
             Decision dictionary with verdict and details
         """
-        print(f"\n{'='*60}")
-        print("DECISION ENGINE")
-        print(f"{'='*60}")
+        key = self._cache_key(module_results) if self.cache_size else None
+        cached = None
+        if key is not None:
+            with self._decision_cache_lock:
+                cached = self._decision_cache.get(key)
+
+        if cached is not None:
+            result = _copy_result(cached)
+        else:
+            module_scores = self._extract_scores(module_results)
+            final_score, scores_vec = self.calculate_weighted_score(module_scores, return_scores=True)
+            result = self._decide_core(module_results, module_scores, final_score, scores_vec)
+            if key is not None:
+                with self._decision_cache_lock:
+                    while len(self._decision_cache) >= self.cache_size:
+                        del self._decision_cache[next(iter(self._decision_cache))]
+                    self._decision_cache[key] = _copy_result(result)
+
+        result['timestamp'] = now.isoformat() if now else _now_iso()
+
+        if logger.isEnabledFor(logging.INFO):
+            self._log_summary(result['module_scores'], result['final_score'])
+            if result['override_applied']:
+                logger.info("WARNING:  Instant %s triggered!\n%s", result['decision'],
+                            '\n'.join(f"   - {reason}" for reason in result['override_reasons']))
+            logger.info("%s", self._format_decision(result))
+
+        return result
+
+    def _cache_key(self, module_results):
+        """
+        Build a hashable key from every input field the decision depends on
 
-        # Extract scores from module results
-        module_scores = {
+        Returns:
+            Tuple key, or None if the inputs cannot be keyed (decision is not cached)
+        """
+        liveness = module_results.get('liveness') or _EMPTY
+        face_match = module_results.get('face_match') or _EMPTY
+        script = module_results.get('script_compliance') or _EMPTY
+        script_inner = script.get('script_compliance') or _EMPTY
+        behavior = module_results.get('behavior') or _EMPTY
+        critical_flags = (behavior.get('behavior_analysis') or _EMPTY).get('critical_flags')
+
+        try:
+            key = (
+                liveness.get('liveness_score', _MISSING),
+                liveness.get('is_live', _MISSING),
+                face_match.get('score', _MISSING),
+                face_match.get('confidence', _MISSING),
+                script.get('score', _MISSING),
+                script_inner.get('critical_failures', _MISSING),
+                tuple(
+                    (item.get('expected_text') or '').lower()
+                    for item in script_inner.get('missing_critical', ())
+                ),
+                (module_results.get('document_verification') or _EMPTY).get('score', _MISSING),
+                behavior.get('score', _MISSING),
+                behavior.get('risk_level', _MISSING),
+                len(critical_flags) if critical_flags else 0,
+                (module_results.get('consent') or _EMPTY).get('score', _MISSING),
+                self.thresholds['pass'],
+                self.thresholds['flag']
+            )
+            hash(key)
+        except (TypeError, AttributeError):
+            return None
+        return key
+
+    def make_decisions_batch(self, module_results_list, now=None):
+        """
+        Make decisions for many sessions at once
+
+        Weighted scores for the whole batch are computed in one pass (compiled
+        with numba when it is installed). Instant conditions and recommendations
+        are still applied per session, so each result matches make_decision.
+        Batches bypass the decision cache and are not logged per session.
+
+        Args:
+            module_results_list: Sequence of module results dictionaries
+            now: Optional datetime to stamp every result with (defaults to current time)
+
+        Returns:
+            List of decision dictionaries, in input order
+        """
+        timestamp = now.isoformat() if now else _now_iso()
+        all_scores = [self._extract_scores(module_results) for module_results in module_results_list]
+        if not all_scores:
+            return []
+
+        present = np.array(
+            [[scores[k] is not None for k in self._weight_keys] for scores in all_scores],
+            dtype=bool
+        )
+        score_matrix = np.array(
+            [[np.nan if scores[k] is None else scores[k] for k in self._weight_keys] for scores in all_scores],
+            dtype=np.float64
+        )
+        final_scores = _batch_weighted_scores(score_matrix, present, self._weight_vec).tolist()
+
+        results = []
+        for module_results, module_scores, final_score, scores_vec in zip(
+                module_results_list, all_scores, final_scores, score_matrix):
+            result = self._decide_core(module_results, module_scores, round(final_score, 2), scores_vec)
+            result['timestamp'] = timestamp
+            results.append(result)
+
+        logger.info("Decided %d sessions in batch", len(results))
+        return results
+
+    def _extract_scores(self, module_results):
+        """Pull each module's score out of its results, with per-module defaults"""
+        return {
             'liveness': module_results.get('liveness', {}).get('liveness_score', 0),
             'face_match': module_results.get('face_match', {}).get('score', 0),
             'script_compliance': module_results.get('script_compliance', {}).get('score', 0),
@@ -169,91 +438,42 @@ class DecisionEngine:
             'consent': module_results.get('consent', {}).get('score', 100)
         }
 
-        print("Module Scores:")
-        for module, score in module_scores.items():
-            weight = self.weights.get(module, 0) * 100
-            print(f"  {module}: {score}/100 (weight: {weight}%)")
-
-        # Calculate weighted score
-        final_score = self.calculate_weighted_score(module_scores)
-        print(f"\nWeighted Score: {final_score}/100")
-
+    def _decide_core(self, module_results, module_scores, final_score, scores_vec):
+        """Compute the decision from scored module results (timestamp is stamped by the caller)"""
         # Check instant conditions first
         override_decision, override_reasons = self.check_instant_conditions(module_results)
 
         if override_decision:
-            decision = override_decision
-            decision_reason = override_reasons[0] if override_reasons else "Automatic trigger"
-            print(f"\nWARNING:  Instant {decision.value} triggered!")
-            for reason in override_reasons:
-                print(f"   - {reason}")
+            result = self._result_template.copy()
+            result['decision'] = self._REJECT_VAL if override_decision is self._REJECT else self._FLAG_VAL
+            result['decision_reason'] = override_reasons[0] if override_reasons else "Automatic trigger"
+            result['override_applied'] = True
+            result['override_reasons'] = override_reasons
         else:
             # Apply threshold-based decision
             if final_score >= self.thresholds['pass']:
-                decision = Decision.PASS
-                decision_reason = "All checks passed with sufficient score"
+                result = self._threshold_templates[0].copy()
             elif final_score >= self.thresholds['flag']:
-                decision = Decision.FLAG
-                decision_reason = "Score below pass threshold, requires manual review"
+                result = self._threshold_templates[1].copy()
             else:
-                decision = Decision.REJECT
-                decision_reason = "Score too low, verification failed"
-
-        # Build result
-        result = {
-            'decision': decision.value,
-            'final_score': final_score,
-            'decision_reason': decision_reason,
-            'override_applied': override_decision is not None,
-            'override_reasons': override_reasons if override_decision else [],
-            'module_scores': module_scores,
-            'module_passed': {
-                module: score >= 60
-                for module, score in module_scores.items()
-            },
-            'thresholds': self.thresholds,
-            'weights': self.weights,
-            'timestamp': datetime.now().isoformat(),
-            'recommendations': self._generate_recommendations(module_scores, module_results)
-        }
-
-        # Print final decision
-        self._print_decision(result)
+                result = self._threshold_templates[2].copy()
+            result['override_reasons'] = []
 
+        result['final_score'] = final_score
+        result['module_scores'] = module_scores
+        result['module_passed'] = dict(zip(self._weight_keys, (scores_vec >= 60).tolist()))
+        result['recommendations'] = self._generate_recommendations(scores_vec, module_results)
         return result
 
-    def _generate_recommendations(self, module_scores, module_results):
+    def _generate_recommendations(self, scores_vec, module_results):
         """Generate recommendations based on results"""
-        recommendations = []
-
-        # Check each module for issues
-        if module_scores.get('liveness', 0) < 60:
-            recommendations.append({
-                'module': 'liveness',
-                'issue': 'Low liveness score',
-                'recommendation': 'Verify video is not a replay. Check for natural blinks and movements.'
-            })
-
-        if module_scores.get('face_match', 0) < 60:
-            recommendations.append({
-                'module': 'face_match',
-                'issue': 'Face match failed',
-                'recommendation': 'Manually verify face against document. Consider re-recording with better lighting.'
-            })
-
-        if module_scores.get('script_compliance', 0) < 60:
-            recommendations.append({
-                'module': 'script_compliance',
-                'issue': 'Script not followed completely',
-                'recommendation': 'Review transcript for missing mandatory questions.'
-            })
-
-        if module_scores.get('behavior', 0) < 60:
-            recommendations.append({
-                'module': 'behavior',
-                'issue': 'Suspicious behavior detected',
-                'recommendation': 'Review flagged segments for evasion or resistance patterns.'
-            })
+        # Check each module for issues (score below 60)
+        below = (scores_vec[self._rec_indices] < 60).tolist()
+        recommendations = [
+            {'module': module, 'issue': issue, 'recommendation': recommendation}
+            for (module, issue, recommendation), hit in zip(self._REC_TABLE, below)
+            if hit
+        ]
 
         # Add module-specific recommendations
         behavior_results = module_results.get('behavior', {})
@@ -268,8 +488,17 @@ class DecisionEngine:
 
         return recommendations
 
-    def _print_decision(self, result):
-        """Print final decision"""
+    def _log_summary(self, module_scores, final_score):
+        """Log the per-module score breakdown"""
+        lines = [f"{'='*60}", "DECISION ENGINE", f"{'='*60}", "Module Scores:"]
+        for module, score in module_scores.items():
+            weight = self.weights.get(module, 0) * 100
+            lines.append(f"  {module}: {score}/100 (weight: {weight}%)")
+        lines.append(f"Weighted Score: {final_score}/100")
+        logger.info("%s", '\n'.join(lines))
+
+    def _format_decision(self, result):
+        """Format final decision as a multi-line string"""
         decision = result['decision']
 
         # Color coding for terminal (if supported)
@@ -280,24 +509,68 @@ class DecisionEngine:
         else:
             status = '[REJECT] REJECTED'
 
-        print(f"\n{'='*60}")
-        print(f"FINAL DECISION: {status}")
-        print(f"{'='*60}")
-        print(f"Score: {result['final_score']}/100")
-        print(f"Reason: {result['decision_reason']}")
+        lines = [
+            f"{'='*60}",
+            f"FINAL DECISION: {status}",
+            f"{'='*60}",
+            f"Score: {result['final_score']}/100",
+            f"Reason: {result['decision_reason']}"
+        ]
 
         if result['recommendations']:
-            print(f"\nRecommendations:")
+            lines.append("Recommendations:")
             for rec in result['recommendations'][:3]:
-                print(f"  - [{rec['module']}] {rec['recommendation']}")
+                lines.append(f"  - [{rec['module']}] {rec['recommendation']}")
 
-        print(f"{'='*60}\n")
+        lines.append(f"{'='*60}")
+        return '\n'.join(lines)
 
     def save_decision(self, result, output_path):
         """Save decision to JSON file"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"Decision saved to: {output_path}")
+        with open(output_path, 'wb') as f:
+            f.write(_dumps(result))
+        logger.info("Decision saved to: %s", output_path)
+
+
+def _now_iso():
+    """Current local time in isoformat(), re-formatting the date part only when the second changes"""
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    if getattr(_iso_cache, 'sec', None) != sec:
+        _iso_cache.sec = sec
+        _iso_cache.iso = datetime.fromtimestamp(sec).isoformat()
+    micros = frac // 1000
+    return f"{_iso_cache.iso}.{micros:06d}" if micros else _iso_cache.iso
+
+
+def _copy_result(result):
+    """Copy a decision result deeply enough that callers can mutate it freely"""
+    copied = dict(result)
+    copied['override_reasons'] = list(result['override_reasons'])
+    copied['module_scores'] = dict(result['module_scores'])
+    copied['module_passed'] = dict(result['module_passed'])
+    copied['recommendations'] = [dict(rec) for rec in result['recommendations']]
+    return copied
+
+
+@lru_cache(maxsize=1024)
+def _ensure_dir(path):
+    """Create an output directory once per process"""
+    os.makedirs(path, exist_ok=True)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _get_engine():
+    """Return the shared DecisionEngine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = DecisionEngine()
+    return _engine
 
 
 def make_kyc_decision(module_results, output_dir=None):
@@ -311,12 +584,13 @@ def make_kyc_decision(module_results, output_dir=None):
     Returns:
         Decision result
     """
-    engine = DecisionEngine()
-    result = engine.make_decision(module_results)
+    now = datetime.now()
+    engine = _get_engine()
+    result = engine.make_decision(module_results, now=now)
 
     if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        _ensure_dir(output_dir)
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         output_path = os.path.join(output_dir, f'decision_{timestamp}.json')
         engine.save_decision(result, output_path)
 
@@ -324,6 +598,8 @@ def make_kyc_decision(module_results, output_dir=None):
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Test with sample data
     sample_results = {
         'liveness': {'liveness_score': 85, 'is_live': True},
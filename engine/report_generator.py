@@ -3,10 +3,275 @@ Report Generator
 Creates comprehensive KYC verification reports
 """
 
+import bisect
 import os
 import json
+import operator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import numpy as np
+    _NP_TYPES = (np.ndarray, np.generic)
+except ImportError:
+    _NP_TYPES = ()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj):
+    """Serialize values orjson doesn't handle natively"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if _NP_TYPES and isinstance(obj, _NP_TYPES):
+        # ndarray.tolist() / generic.item(); also covers arrays OPT_SERIALIZE_NUMPY rejects
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Marks a field absent from module results (distinct from an explicit None)
+_MISSING = object()
+
+
+def _spec(out_key, in_key, default, transform=None):
+    """One summary field: dotted output/input paths, default (callable = factory) and optional transform"""
+    return tuple(out_key.split('.')), tuple(in_key.split('.')), default, transform
+
+
+# Per-module detailed_results summaries, in output order
+_SUMMARY_SPECS = {
+    'liveness': (
+        _spec('score', 'liveness_score', 0),
+        _spec('is_live', 'is_live', False),
+        _spec('confidence', 'confidence', 'UNKNOWN'),
+        _spec('checks.blink_detection', 'detailed_results.blink_analysis.liveness_indicator', False),
+        _spec('checks.head_movement', 'detailed_results.movement_analysis.liveness_indicator', False),
+        _spec('checks.screen_replay', 'detailed_results.screen_replay_analysis.screen_replay_detected', True,
+              operator.not_),
+        _spec('checks.texture_analysis', 'detailed_results.texture_analysis.liveness_indicator', False)
+    ),
+    'face_match': (
+        _spec('score', 'score', 0),
+        _spec('passed', 'passed', False),
+        _spec('confidence', 'confidence', 'UNKNOWN'),
+        _spec('max_similarity', 'max_similarity', 0),
+        _spec('verification_rate', 'details.verification_rate', 0)
+    ),
+    'script_compliance': (
+        _spec('score', 'score', 0),
+        _spec('is_compliant', 'script_compliance.is_compliant', False),
+        _spec('checks_passed', 'script_compliance.passed_checks', 0),
+        _spec('checks_total', 'script_compliance.total_checks', 0),
+        _spec('critical_failures', 'script_compliance.critical_failures', 0),
+        _spec('sections_covered', 'script_compliance.sections_covered', list)
+    ),
+    'behavior': (
+        _spec('score', 'score', 0),
+        _spec('risk_level', 'risk_level', 'UNKNOWN'),
+        _spec('total_flags', 'behavior_analysis.total_flags', 0),
+        _spec('critical_flags', 'behavior_analysis.critical_flags', (), len),
+        _spec('categories', 'behavior_analysis.category_counts', dict)
+    )
+}
+
+
+# Escapes text interpolated into HTML reports in a single str.translate pass
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+
+def _escape(value):
+    """HTML-escape a value for the report (same output as html.escape)"""
+    return str(value).translate(_HTML_ESCAPE)
+
+
+# Shared stand-in for missing sections (read-only, never mutate)
+_EMPTY = {}
+
+
+# Confidence bands: score >= 85 HIGH, >= 70 MEDIUM, >= 50 LOW, else VERY LOW
+_CONFIDENCE_THRESHOLDS = (50, 70, 85)
+_CONFIDENCE_LABELS = ('VERY LOW', 'LOW', 'MEDIUM', 'HIGH')
+
+# Decision box colours, keyed by verdict
+_DECISION_COLORS = {
+    'PASS': '#28a745',
+    'FLAG': '#ffc107',
+    'REJECT': '#dc3545'
+}
+_DEFAULT_COLOR = '#6c757d'
+
+# HTML report layout, filled by ReportGenerator._iter_html
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Video KYC Report - {report_id}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{ font-family: 'Segoe UI', sans-serif; background: #f5f5f5; padding: 20px; }}
+        .container {{ max-width: 1000px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+        header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px 10px 0 0; }}
+        header h1 {{ font-size: 1.8em; margin-bottom: 10px; }}
+        .content {{ padding: 30px; }}
+        .decision-box {{ text-align: center; padding: 30px; margin: 20px 0; border-radius: 10px; background: {decision_color}22; border: 2px solid {decision_color}; }}
+        .decision-box h2 {{ color: {decision_color}; font-size: 2em; }}
+        .decision-box .score {{ font-size: 3em; color: {decision_color}; margin: 10px 0; }}
+        .section {{ margin: 30px 0; }}
+        .section h3 {{ color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 10px; margin-bottom: 15px; }}
+        .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
+        .card {{ background: #f8f9fa; padding: 15px; border-radius: 8px; border-left: 4px solid #667eea; }}
+        .card h4 {{ color: #333; margin-bottom: 8px; }}
+        .card .value {{ font-size: 1.5em; color: #667eea; }}
+        .card.pass {{ border-color: #28a745; }}
+        .card.pass .value {{ color: #28a745; }}
+        .card.fail {{ border-color: #dc3545; }}
+        .card.fail .value {{ color: #dc3545; }}
+        .red-flags {{ background: #fff3cd; padding: 20px; border-radius: 8px; border-left: 4px solid #ffc107; }}
+        .red-flag-item {{ padding: 10px; margin: 10px 0; background: white; border-radius: 5px; border-left: 3px solid #dc3545; }}
+        .recommendations {{ background: #d1ecf1; padding: 20px; border-radius: 8px; }}
+        .recommendations li {{ margin: 10px 0; padding: 10px; background: white; border-radius: 5px; }}
+        table {{ width: 100%; border-collapse: collapse; }}
+        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }}
+        th {{ background: #667eea; color: white; }}
+        footer {{ text-align: center; padding: 20px; color: #666; font-size: 0.9em; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>Video KYC Verification Report</h1>
+            <p>Report ID: {report_id}</p>
+            <p>Generated: {generated_at}</p>
+        </header>
+
+        <div class="content">
+            <div class="decision-box">
+                <h2>DECISION: {decision}</h2>
+                <div class="score">{final_score}/100</div>
+                <p>Confidence: {confidence}</p>
+                <p>{recommendation}</p>
+            </div>
+
+            <div class="section">
+                <h3>Video Information</h3>
+                <div class="grid">
+                    <div class="card">
+                        <h4>File</h4>
+                        <p>{video_file}</p>
+                    </div>
+                    <div class="card">
+                        <h4>Duration</h4>
+                        <p>{duration}</p>
+                    </div>
+                    <div class="card">
+                        <h4>Resolution</h4>
+                        <p>{resolution}</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="section">
+                <h3>Module Scores</h3>
+                <div class="grid">
+                    {module_cards}
+                </div>
+            </div>
+
+            <div class="section">
+                <h3>Detailed Analysis</h3>
+                <table>
+                    <tr><th>Check</th><th>Status</th><th>Details</th></tr>
+                    {analysis_rows}
+                </table>
+            </div>
+
+            {red_flags_section}
+
+            {recommendations_section}
+        </div>
+
+        <footer>
+            <p>Video KYC AI Checker - Automated Verification Report</p>
+            <p>This report is generated automatically and may require manual review.</p>
+        </footer>
+    </div>
+</body>
+</html>"""
+
+
+def _split_template(template, fields):
+    """Split a template around the given {field} placeholders, in order"""
+    parts = []
+    rest = template
+    for field in fields:
+        part, rest = rest.split('{' + field + '}', 1)
+        parts.append(part)
+    parts.append(rest)
+    return tuple(parts)
+
+
+# Static template text between the generated sub-sections
+_HTML_PARTS = _split_template(
+    _HTML_TEMPLATE,
+    ('module_cards', 'analysis_rows', 'red_flags_section', 'recommendations_section')
+)
+
+
+# HTML fragments for the repeated report sub-sections
+_CARD_TEMPLATE = '''
+                <div class="card {status_class}">
+                    <h4>{module_name}</h4>
+                    <div class="value">{score}/100</div>
+                    <p>{status}</p>
+                </div>
+            '''
+
+_ROW_TEMPLATE = '''
+                <tr>
+                    <td>{label}</td>
+                    <td>{status}</td>
+                    <td>{details}</td>
+                </tr>
+            '''
+
+_RED_FLAG_TEMPLATE = '''<div class="red-flag-item">
+                <strong>[{severity}]</strong> {description}
+                {timestamp}
+            </div>'''
+
+_RECOMMENDATION_TEMPLATE = '<li><strong>[{module}]</strong> {recommendation}</li>'
+
+
+def _pass_fail(ok):
+    return "[PASS] PASS" if ok else "[FAIL] FAIL"
+
+
+# Detailed analysis table: (detailed_results key, label, status cell, details cell)
+_ANALYSIS_ROWS = (
+    ('liveness', 'Liveness Detection',
+     lambda r: _pass_fail(r.get('is_live', False)),
+     lambda r: f"Score: {r.get('score', 0)}, Confidence: {r.get('confidence', 'N/A')}"),
+    ('face_match', 'Face Match',
+     lambda r: _pass_fail(r.get('passed', False)),
+     lambda r: f"Score: {r.get('score', 0)}, Max Similarity: {r.get('max_similarity', 0):.1f}%"),
+    ('script_compliance', 'Script Compliance',
+     lambda r: _pass_fail(r.get('is_compliant', False)),
+     lambda r: f"Checks: {r.get('checks_passed', 0)}/{r.get('checks_total', 0)}, Critical Failures: {r.get('critical_failures', 0)}"),
+    ('behavior', 'Behavior Analysis',
+     lambda r: f"Risk: {r.get('risk_level', 'N/A')}",
+     lambda r: f"Score: {r.get('score', 0)}, Flags: {r.get('total_flags', 0)}")
+)
+
 
 class ReportGenerator:
     """
@@ -14,11 +279,18 @@ class ReportGenerator:
     Supports JSON and HTML formats.
     """
 
-    def __init__(self):
-        """Initialize report generator"""
-        print("Initializing Report Generator...")
+    def __init__(self, quiet=False):
+        """
+        Initialize report generator
 
-    def generate_report(self, video_path, decision_result, module_results, preprocessing_results=None):
+        Args:
+            quiet: Suppress progress output (used by batch workers)
+        """
+        self.quiet = quiet
+        if not quiet:
+            print("Initializing Report Generator...")
+
+    def generate_report(self, video_path, decision_result, module_results, preprocessing_results=None, now=None):
         """
         Generate comprehensive KYC report
 
@@ -27,48 +299,46 @@ class ReportGenerator:
             decision_result: Result from decision engine
             module_results: Results from all analysis modules
             preprocessing_results: Optional preprocessing info
+            now: Optional datetime for the report id and timestamps (defaults to current time)
 
         Returns:
             Report dictionary
         """
+        now = now or datetime.now()
+        generated_at = now.isoformat()
+        decision_get = decision_result.get
+
         report = {
-            'report_id': datetime.now().strftime('%Y%m%d%H%M%S'),
-            'generated_at': datetime.now().isoformat(),
+            'report_id': now.strftime('%Y%m%d%H%M%S'),
+            'generated_at': generated_at,
             'video_file': os.path.basename(video_path),
             'video_path': video_path,
 
             # Executive Summary
-            'summary': {
-                'decision': decision_result.get('decision', 'UNKNOWN'),
-                'final_score': decision_result.get('final_score', 0),
-                'confidence': self._get_confidence_level(decision_result.get('final_score', 0)),
-                'recommendation': decision_result.get('decision_reason', '')
-            },
+            'summary': self._build_summary(decision_result),
 
             # Video Metadata
             'video_metadata': preprocessing_results.get('video_metadata', {}) if preprocessing_results else {},
 
             # Module Scores
-            'module_scores': decision_result.get('module_scores', {}),
-            'module_passed': decision_result.get('module_passed', {}),
+            'module_scores': decision_get('module_scores', {}),
+            'module_passed': decision_get('module_passed', {}),
 
             # Detailed Results
             'detailed_results': {
-                'liveness': self._summarize_liveness(module_results.get('liveness', {})),
-                'face_match': self._summarize_face_match(module_results.get('face_match', {})),
-                'script_compliance': self._summarize_script(module_results.get('script_compliance', {})),
-                'behavior': self._summarize_behavior(module_results.get('behavior', {}))
+                kind: self._summarize(kind, module_results.get(kind, _EMPTY))
+                for kind in _SUMMARY_SPECS
             },
 
             # Red Flags
             'red_flags': self._collect_red_flags(module_results, decision_result),
 
             # Recommendations
-            'recommendations': decision_result.get('recommendations', []),
+            'recommendations': decision_get('recommendations', []),
 
             # Audit Trail
             'audit_trail': {
-                'analysis_timestamp': datetime.now().isoformat(),
+                'analysis_timestamp': generated_at,
                 'modules_executed': list(module_results.keys()),
                 'processing_time': preprocessing_results.get('processing_time', 0) if preprocessing_results else 0
             }
@@ -76,346 +346,212 @@ class ReportGenerator:
 
         return report
 
-    def _get_confidence_level(self, score):
-        """Convert score to confidence level"""
-        if score >= 85:
-            return 'HIGH'
-        elif score >= 70:
-            return 'MEDIUM'
-        elif score >= 50:
-            return 'LOW'
-        else:
-            return 'VERY LOW'
+    def generate_summary_only(self, video_path, decision_result, now=None):
+        """
+        Generate just the report header and executive summary
 
-    def _summarize_liveness(self, liveness_result):
-        """Summarize liveness results"""
-        if not liveness_result:
-            return {'status': 'NOT_ANALYZED'}
+        Skips the module summaries and red-flag collection, for consumers that
+        only need the verdict (e.g. dashboards).
 
-        detailed = liveness_result.get('detailed_results', {})
+        Args:
+            video_path: Path to analyzed video
+            decision_result: Result from decision engine
+            now: Optional datetime for the report id and timestamp (defaults to current time)
 
+        Returns:
+            Dictionary with the same report_id/generated_at/video/summary fields as generate_report
+        """
+        now = now or datetime.now()
         return {
-            'score': liveness_result.get('liveness_score', 0),
-            'is_live': liveness_result.get('is_live', False),
-            'confidence': liveness_result.get('confidence', 'UNKNOWN'),
-            'checks': {
-                'blink_detection': detailed.get('blink_analysis', {}).get('liveness_indicator', False),
-                'head_movement': detailed.get('movement_analysis', {}).get('liveness_indicator', False),
-                'screen_replay': not detailed.get('screen_replay_analysis', {}).get('screen_replay_detected', True),
-                'texture_analysis': detailed.get('texture_analysis', {}).get('liveness_indicator', False)
-            }
+            'report_id': now.strftime('%Y%m%d%H%M%S'),
+            'generated_at': now.isoformat(),
+            'video_file': os.path.basename(video_path),
+            'video_path': video_path,
+            'summary': self._build_summary(decision_result)
         }
 
-    def _summarize_face_match(self, face_result):
-        """Summarize face match results"""
-        if not face_result:
-            return {'status': 'NOT_ANALYZED'}
-
+    def _build_summary(self, decision_result):
+        """Build the executive summary section from a decision result"""
+        final_score = decision_result.get('final_score', 0)
         return {
-            'score': face_result.get('score', 0),
-            'passed': face_result.get('passed', False),
-            'confidence': face_result.get('confidence', 'UNKNOWN'),
-            'max_similarity': face_result.get('max_similarity', 0),
-            'verification_rate': face_result.get('details', {}).get('verification_rate', 0)
+            'decision': decision_result.get('decision', 'UNKNOWN'),
+            'final_score': final_score,
+            'confidence': self._get_confidence_level(final_score),
+            'recommendation': decision_result.get('decision_reason', '')
         }
 
-    def _summarize_script(self, script_result):
-        """Summarize script compliance results"""
-        if not script_result:
-            return {'status': 'NOT_ANALYZED'}
-
-        script_compliance = script_result.get('script_compliance', {})
-
-        return {
-            'score': script_result.get('score', 0),
-            'is_compliant': script_compliance.get('is_compliant', False),
-            'checks_passed': script_compliance.get('passed_checks', 0),
-            'checks_total': script_compliance.get('total_checks', 0),
-            'critical_failures': script_compliance.get('critical_failures', 0),
-            'sections_covered': script_compliance.get('sections_covered', [])
-        }
+    def _get_confidence_level(self, score):
+        """Convert score to confidence level"""
+        # bisect places NaN past every threshold; a broken score is never confident
+        if not score == score:
+            return 'VERY LOW'
+        return _CONFIDENCE_LABELS[bisect.bisect_right(_CONFIDENCE_THRESHOLDS, score)]
 
-    def _summarize_behavior(self, behavior_result):
-        """Summarize behavior analysis results"""
-        if not behavior_result:
+    def _summarize(self, kind, result):
+        """Summarize one module's results according to its _SUMMARY_SPECS entry"""
+        if not result:
             return {'status': 'NOT_ANALYZED'}
 
-        behavior_analysis = behavior_result.get('behavior_analysis', {})
-
-        return {
-            'score': behavior_result.get('score', 0),
-            'risk_level': behavior_result.get('risk_level', 'UNKNOWN'),
-            'total_flags': behavior_analysis.get('total_flags', 0),
-            'critical_flags': len(behavior_analysis.get('critical_flags', [])),
-            'categories': behavior_analysis.get('category_counts', {})
-        }
+        summary = {}
+        for out_path, in_path, default, transform in _SUMMARY_SPECS[kind]:
+            # Walk nested sections, treating missing levels as empty
+            section = result
+            for key in in_path[:-1]:
+                section = section.get(key, _EMPTY)
+            value = section.get(in_path[-1], _MISSING)
+            if value is _MISSING:
+                value = default() if callable(default) else default
+            if transform is not None:
+                value = transform(value)
+
+            target = summary
+            for key in out_path[:-1]:
+                target = target.setdefault(key, {})
+            target[out_path[-1]] = value
+        return summary
 
     def _collect_red_flags(self, module_results, decision_result):
         """Collect all red flags from analysis"""
-        red_flags = []
+        liveness = module_results.get('liveness', _EMPTY)
+        detailed = liveness.get('detailed_results', _EMPTY)
+        face_match = module_results.get('face_match', _EMPTY)
+        behavior_analysis = module_results.get('behavior', _EMPTY).get('behavior_analysis', _EMPTY)
+        script_compliance = module_results.get('script_compliance', _EMPTY).get('script_compliance', _EMPTY)
 
         # From decision engine overrides
-        for reason in decision_result.get('override_reasons', []):
-            red_flags.append({
-                'source': 'decision_engine',
-                'severity': 'CRITICAL',
-                'description': reason
-            })
+        red_flags = [
+            {'source': 'decision_engine', 'severity': 'CRITICAL', 'description': reason}
+            for reason in decision_result.get('override_reasons', ())
+        ]
+        append = red_flags.append
 
         # From liveness
-        liveness = module_results.get('liveness', {})
         if not liveness.get('is_live', True):
-            red_flags.append({
+            append({
                 'source': 'liveness',
                 'severity': 'CRITICAL',
                 'description': 'Video may not be live - possible replay attack'
             })
 
-        detailed = liveness.get('detailed_results', {})
-        if detailed.get('screen_replay_analysis', {}).get('screen_replay_detected', False):
-            red_flags.append({
+        if detailed.get('screen_replay_analysis', _EMPTY).get('screen_replay_detected', False):
+            append({
                 'source': 'liveness',
                 'severity': 'CRITICAL',
                 'description': 'Screen replay attack detected'
             })
 
         # From face match
-        face_match = module_results.get('face_match', {})
         if face_match.get('score', 100) < 50:
-            red_flags.append({
+            append({
                 'source': 'face_match',
                 'severity': 'CRITICAL',
                 'description': f"Face match score too low: {face_match.get('score', 0)}%"
             })
 
         # From behavior
-        behavior = module_results.get('behavior', {})
-        behavior_analysis = behavior.get('behavior_analysis', {})
-        for flag in behavior_analysis.get('critical_flags', [])[:5]:
-            red_flags.append({
+        red_flags.extend(
+            {
                 'source': 'behavior',
                 'severity': 'HIGH',
                 'description': f"Suspicious statement: {flag.get('text', '')[:100]}",
                 'timestamp': flag.get('timestamp_formatted', '')
-            })
+            }
+            for flag in behavior_analysis.get('critical_flags', [])[:5]
+        )
 
         # From script compliance
-        script = module_results.get('script_compliance', {})
-        script_compliance = script.get('script_compliance', {})
-        for item in script_compliance.get('missing_critical', []):
-            red_flags.append({
+        red_flags.extend(
+            {
                 'source': 'script_compliance',
                 'severity': 'HIGH',
                 'description': f"Missing critical check: {item.get('expected_text', '')[:50]}"
-            })
+            }
+            for item in script_compliance.get('missing_critical', ())
+        )
 
         return red_flags
 
     def save_json_report(self, report, output_path):
         """Save report as JSON"""
-        import numpy as np
-
-        def convert_types(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.bool_):
-                return bool(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {k: convert_types(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_types(i) for i in obj]
-            elif isinstance(obj, set):
-                return list(obj)
-            return obj
-
-        clean_report = convert_types(report)
-
+        if orjson is not None:
+            data = orjson.dumps(
+                report,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            if not self.quiet:
+                print(f"JSON report saved to: {output_path}")
+            return
+
+        # numpy values and sets are converted lazily by the encoder's default hook
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(clean_report, f, indent=2, ensure_ascii=False)
-        print(f"JSON report saved to: {output_path}")
+            json.dump(report, f, indent=2, ensure_ascii=False, default=_json_default)
+        if not self.quiet:
+            print(f"JSON report saved to: {output_path}")
 
     def save_html_report(self, report, output_path):
         """Save report as HTML"""
-        html = self._generate_html(report)
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-        print(f"HTML report saved to: {output_path}")
+            f.writelines(self._iter_html(report))
+        if not self.quiet:
+            print(f"HTML report saved to: {output_path}")
 
     def _generate_html(self, report):
         """Generate HTML report"""
-        decision = report['summary']['decision']
-        decision_color = {
-            'PASS': '#28a745',
-            'FLAG': '#ffc107',
-            'REJECT': '#dc3545'
-        }.get(decision, '#6c757d')
-
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Video KYC Report - {report['report_id']}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Segoe UI', sans-serif; background: #f5f5f5; padding: 20px; }}
-        .container {{ max-width: 1000px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px 10px 0 0; }}
-        header h1 {{ font-size: 1.8em; margin-bottom: 10px; }}
-        .content {{ padding: 30px; }}
-        .decision-box {{ text-align: center; padding: 30px; margin: 20px 0; border-radius: 10px; background: {decision_color}22; border: 2px solid {decision_color}; }}
-        .decision-box h2 {{ color: {decision_color}; font-size: 2em; }}
-        .decision-box .score {{ font-size: 3em; color: {decision_color}; margin: 10px 0; }}
-        .section {{ margin: 30px 0; }}
-        .section h3 {{ color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 10px; margin-bottom: 15px; }}
-        .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
-        .card {{ background: #f8f9fa; padding: 15px; border-radius: 8px; border-left: 4px solid #667eea; }}
-        .card h4 {{ color: #333; margin-bottom: 8px; }}
-        .card .value {{ font-size: 1.5em; color: #667eea; }}
-        .card.pass {{ border-color: #28a745; }}
-        .card.pass .value {{ color: #28a745; }}
-        .card.fail {{ border-color: #dc3545; }}
-        .card.fail .value {{ color: #dc3545; }}
-        .red-flags {{ background: #fff3cd; padding: 20px; border-radius: 8px; border-left: 4px solid #ffc107; }}
-        .red-flag-item {{ padding: 10px; margin: 10px 0; background: white; border-radius: 5px; border-left: 3px solid #dc3545; }}
-        .recommendations {{ background: #d1ecf1; padding: 20px; border-radius: 8px; }}
-        .recommendations li {{ margin: 10px 0; padding: 10px; background: white; border-radius: 5px; }}
-        table {{ width: 100%; border-collapse: collapse; }}
-        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }}
-        th {{ background: #667eea; color: white; }}
-        footer {{ text-align: center; padding: 20px; color: #666; font-size: 0.9em; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>Video KYC Verification Report</h1>
-            <p>Report ID: {report['report_id']}</p>
-            <p>Generated: {report['generated_at']}</p>
-        </header>
-
-        <div class="content">
-            <div class="decision-box">
-                <h2>DECISION: {decision}</h2>
-                <div class="score">{report['summary']['final_score']}/100</div>
-                <p>Confidence: {report['summary']['confidence']}</p>
-                <p>{report['summary']['recommendation']}</p>
-            </div>
-
-            <div class="section">
-                <h3>Video Information</h3>
-                <div class="grid">
-                    <div class="card">
-                        <h4>File</h4>
-                        <p>{report['video_file']}</p>
-                    </div>
-                    <div class="card">
-                        <h4>Duration</h4>
-                        <p>{report['video_metadata'].get('duration_formatted', 'N/A')}</p>
-                    </div>
-                    <div class="card">
-                        <h4>Resolution</h4>
-                        <p>{report['video_metadata'].get('resolution', 'N/A')}</p>
-                    </div>
-                </div>
-            </div>
+        return ''.join(self._iter_html(report))
 
-            <div class="section">
-                <h3>Module Scores</h3>
-                <div class="grid">
-                    {self._generate_module_cards(report['module_scores'], report['module_passed'])}
-                </div>
-            </div>
-
-            <div class="section">
-                <h3>Detailed Analysis</h3>
-                <table>
-                    <tr><th>Check</th><th>Status</th><th>Details</th></tr>
-                    {self._generate_analysis_rows(report['detailed_results'])}
-                </table>
-            </div>
-
-            {self._generate_red_flags_section(report['red_flags'])}
-
-            {self._generate_recommendations_section(report['recommendations'])}
-        </div>
-
-        <footer>
-            <p>Video KYC AI Checker - Automated Verification Report</p>
-            <p>This report is generated automatically and may require manual review.</p>
-        </footer>
-    </div>
-</body>
-</html>"""
-        return html
+    def _iter_html(self, report):
+        """Yield the HTML report in fragments, rendering each sub-section only when reached"""
+        decision = report['summary']['decision']
+        fields = {
+            'report_id': report['report_id'],
+            'generated_at': report['generated_at'],
+            'decision': decision,
+            'decision_color': _DECISION_COLORS.get(decision, _DEFAULT_COLOR),
+            'final_score': report['summary']['final_score'],
+            'confidence': report['summary']['confidence'],
+            'recommendation': _escape(report['summary']['recommendation']),
+            'video_file': _escape(report['video_file']),
+            'duration': report['video_metadata'].get('duration_formatted', 'N/A'),
+            'resolution': report['video_metadata'].get('resolution', 'N/A')
+        }
+        head, after_cards, after_rows, after_flags, tail = _HTML_PARTS
+
+        yield head.format_map(fields)
+        yield self._generate_module_cards(report['module_scores'], report['module_passed'])
+        yield after_cards
+        yield self._generate_analysis_rows(report['detailed_results'])
+        yield after_rows
+        yield self._generate_red_flags_section(report['red_flags'])
+        yield after_flags
+        yield self._generate_recommendations_section(report['recommendations'])
+        yield tail.format_map(fields)
 
     def _generate_module_cards(self, scores, passed):
         """Generate HTML cards for each module"""
+        passed_get = passed.get
         cards = []
+        append = cards.append
         for module, score in scores.items():
-            status_class = 'pass' if passed.get(module, False) else 'fail'
-            module_name = module.replace('_', ' ').title()
-            cards.append(f'''
-                <div class="card {status_class}">
-                    <h4>{module_name}</h4>
-                    <div class="value">{score}/100</div>
-                    <p>{"PASSED" if passed.get(module, False) else "FAILED"}</p>
-                </div>
-            ''')
+            ok = passed_get(module, False)
+            append(_CARD_TEMPLATE.format(
+                status_class='pass' if ok else 'fail',
+                module_name=module.replace('_', ' ').title(),
+                score=score,
+                status='PASSED' if ok else 'FAILED'
+            ))
         return '\n'.join(cards)
 
     def _generate_analysis_rows(self, detailed):
         """Generate table rows for detailed analysis"""
         rows = []
-
-        # Liveness
-        liveness = detailed.get('liveness', {})
-        if liveness.get('status') != 'NOT_ANALYZED':
-            rows.append(f'''
-                <tr>
-                    <td>Liveness Detection</td>
-                    <td>{"[PASS] PASS" if liveness.get('is_live', False) else "[FAIL] FAIL"}</td>
-                    <td>Score: {liveness.get('score', 0)}, Confidence: {liveness.get('confidence', 'N/A')}</td>
-                </tr>
-            ''')
-
-        # Face Match
-        face = detailed.get('face_match', {})
-        if face.get('status') != 'NOT_ANALYZED':
-            rows.append(f'''
-                <tr>
-                    <td>Face Match</td>
-                    <td>{"[PASS] PASS" if face.get('passed', False) else "[FAIL] FAIL"}</td>
-                    <td>Score: {face.get('score', 0)}, Max Similarity: {face.get('max_similarity', 0):.1f}%</td>
-                </tr>
-            ''')
-
-        # Script Compliance
-        script = detailed.get('script_compliance', {})
-        if script.get('status') != 'NOT_ANALYZED':
-            rows.append(f'''
-                <tr>
-                    <td>Script Compliance</td>
-                    <td>{"[PASS] PASS" if script.get('is_compliant', False) else "[FAIL] FAIL"}</td>
-                    <td>Checks: {script.get('checks_passed', 0)}/{script.get('checks_total', 0)}, Critical Failures: {script.get('critical_failures', 0)}</td>
-                </tr>
-            ''')
-
-        # Behavior
-        behavior = detailed.get('behavior', {})
-        if behavior.get('status') != 'NOT_ANALYZED':
-            rows.append(f'''
-                <tr>
-                    <td>Behavior Analysis</td>
-                    <td>Risk: {behavior.get('risk_level', 'N/A')}</td>
-                    <td>Score: {behavior.get('score', 0)}, Flags: {behavior.get('total_flags', 0)}</td>
-                </tr>
-            ''')
-
+        append = rows.append
+        for key, label, status_fn, details_fn in _ANALYSIS_ROWS:
+            result = detailed.get(key, _EMPTY)
+            if result.get('status') != 'NOT_ANALYZED':
+                append(_ROW_TEMPLATE.format(label=label, status=status_fn(result), details=details_fn(result)))
         return '\n'.join(rows)
 
     def _generate_red_flags_section(self, red_flags):
@@ -423,13 +559,16 @@ class ReportGenerator:
         if not red_flags:
             return ''
 
-        flags_html = '\n'.join([
-            f'''<div class="red-flag-item">
-                <strong>[{flag.get('severity', 'INFO')}]</strong> {flag.get('description', '')}
-                {f"<br><small>Timestamp: {flag.get('timestamp', '')}</small>" if flag.get('timestamp') else ''}
-            </div>'''
-            for flag in red_flags
-        ])
+        items = []
+        append = items.append
+        for flag in red_flags:
+            timestamp = flag.get('timestamp')
+            append(_RED_FLAG_TEMPLATE.format(
+                severity=flag.get('severity', 'INFO'),
+                description=_escape(flag.get('description', '')),
+                timestamp=f"<br><small>Timestamp: {_escape(timestamp)}</small>" if timestamp else ''
+            ))
+        flags_html = '\n'.join(items)
 
         return f'''
             <div class="section">
@@ -446,7 +585,10 @@ class ReportGenerator:
             return ''
 
         recs_html = '\n'.join([
-            f'''<li><strong>[{rec.get('module', 'General')}]</strong> {rec.get('recommendation', '')}</li>'''
+            _RECOMMENDATION_TEMPLATE.format(
+                module=_escape(rec.get('module', 'General')),
+                recommendation=_escape(rec.get('recommendation', ''))
+            )
             for rec in recommendations
         ])
 
@@ -460,7 +602,8 @@ class ReportGenerator:
         '''
 
 
-def generate_report(video_path, decision_result, module_results, preprocessing_results=None, output_dir=None):
+def generate_report(video_path, decision_result, module_results, preprocessing_results=None, output_dir=None,
+                    formats=('json', 'html')):
     """
     Convenience function to generate report
 
@@ -470,23 +613,75 @@ def generate_report(video_path, decision_result, module_results, preprocessing_r
         module_results: All module results
         preprocessing_results: Optional preprocessing info
         output_dir: Optional output directory
+        formats: Report formats to save to output_dir ('json' and/or 'html')
 
     Returns:
         Report dictionary
     """
+    now = datetime.now()
     generator = ReportGenerator()
-    report = generator.generate_report(video_path, decision_result, module_results, preprocessing_results)
+    report = generator.generate_report(video_path, decision_result, module_results, preprocessing_results, now=now)
 
-    if output_dir:
+    savers = []
+    if 'json' in formats:
+        savers.append((generator.save_json_report, '.json'))
+    if 'html' in formats:
+        savers.append((generator.save_html_report, '.html'))
+
+    if output_dir and savers:
         os.makedirs(output_dir, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base_path = os.path.join(output_dir, f"kyc_report_{now.strftime('%Y%m%d_%H%M%S')}")
+
+        if len(savers) == 1:
+            save, ext = savers[0]
+            save(report, base_path + ext)
+        else:
+            # Save JSON and HTML concurrently; both are file-write bound
+            with ThreadPoolExecutor(max_workers=len(savers)) as executor:
+                futures = [executor.submit(save, report, base_path + ext) for save, ext in savers]
+            for future in futures:
+                future.result()
+
+    return report
 
-        # Save JSON
-        json_path = os.path.join(output_dir, f'kyc_report_{timestamp}.json')
-        generator.save_json_report(report, json_path)
 
-        # Save HTML
-        html_path = os.path.join(output_dir, f'kyc_report_{timestamp}.html')
-        generator.save_html_report(report, html_path)
+def _generate_report_job(job):
+    """Build and save one report in a worker process (see generate_reports_batch)"""
+    index, video_path, decision_result, module_results, preprocessing_results, output_dir = job
+    now = datetime.now()
+    generator = ReportGenerator(quiet=True)
+    report = generator.generate_report(video_path, decision_result, module_results, preprocessing_results, now=now)
+    # Jobs finishing in the same second would otherwise share a report ID
+    report['report_id'] = f"{report['report_id']}_{index:04d}"
 
+    base_name = f"kyc_report_{now.strftime('%Y%m%d_%H%M%S')}_{index:04d}"
+    generator.save_json_report(report, os.path.join(output_dir, base_name + '.json'))
+    generator.save_html_report(report, os.path.join(output_dir, base_name + '.html'))
     return report
+
+
+def generate_reports_batch(jobs, output_dir, workers=None):
+    """
+    Generate and save reports for many analyses in parallel processes
+
+    Args:
+        jobs: List of (video_path, decision_result, module_results, preprocessing_results) tuples
+        output_dir: Directory to save JSON and HTML reports
+        workers: Number of worker processes (defaults to CPU count)
+
+    Returns:
+        List of report dictionaries, in job order
+    """
+    if not jobs:
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [
+        (index, video_path, decision_result, module_results, preprocessing_results, output_dir)
+        for index, (video_path, decision_result, module_results, preprocessing_results) in enumerate(jobs)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        reports = list(executor.map(_generate_report_job, tasks))
+
+    return reports
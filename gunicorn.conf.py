@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for Video KYC Recording Assistant
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+import threading
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Threaded workers so uploads, capture saves and status polls don't queue
+# behind each other. Every worker keeps its own analyzer pool (models in
+# memory), so scale workers with RAM and threads with concurrent requests.
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Large video uploads can take a while on slow links
+timeout = 300
+
+# Heartbeat files on tmpfs instead of disk
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# Let the kernel send files (sendfile) for downloads and report assets
+sendfile = True
+
+
+def post_worker_init(worker):
+    """Warm the default analyzer in the background, like `python app.py` does"""
+    from app import get_analyzer
+    threading.Thread(target=get_analyzer, args=('base',), daemon=True).start()
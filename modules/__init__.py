@@ -1,14 +1,29 @@
 """
 Video KYC Analysis Modules
+
+Submodules are imported on first attribute access, so importing one module
+(e.g. modules.video_analyzer) doesn't load the whole ML stack.
 """
 
-from .preprocessor import Preprocessor, preprocess_video
-from .transcript_generator import TranscriptGenerator, generate_transcript
-from .liveness_detector import LivenessDetector, check_liveness
-from .face_matcher import FaceMatcher, match_faces
-from .script_checker import ScriptChecker, check_script_compliance
-from .behavior_analyzer import BehaviorAnalyzer, analyze_behavior
-from .video_analyzer import VideoAnalyzer, analyze_video
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY = {
+    'Preprocessor': '.preprocessor',
+    'preprocess_video': '.preprocessor',
+    'TranscriptGenerator': '.transcript_generator',
+    'generate_transcript': '.transcript_generator',
+    'LivenessDetector': '.liveness_detector',
+    'check_liveness': '.liveness_detector',
+    'FaceMatcher': '.face_matcher',
+    'match_faces': '.face_matcher',
+    'ScriptChecker': '.script_checker',
+    'check_script_compliance': '.script_checker',
+    'BehaviorAnalyzer': '.behavior_analyzer',
+    'analyze_behavior': '.behavior_analyzer',
+    'VideoAnalyzer': '.video_analyzer',
+    'analyze_video': '.video_analyzer'
+}
 
 __all__ = [
     'Preprocessor',
@@ -26,3 +41,16 @@ __all__ = [
     'VideoAnalyzer',
     'analyze_video'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,7 +7,117 @@ Red flags: evasion, resistance, unusual responses
 import os
 import json
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters that make a red-flag pattern a real regex rather than a plain phrase
+_REGEX_METACHARS = frozenset('.^$*+?{}[]|()\\')
+
+
+def _literal_phrase(pattern):
+    """Return the lowercase phrase a pattern matches literally, or None if it needs the regex engine"""
+    phrase = pattern.replace("\\'", "'")
+    if _REGEX_METACHARS.intersection(phrase):
+        return None
+    return phrase.lower()
+
+
+@lru_cache(maxsize=8)
+def _compile_red_flags(categories):
+    """
+    Compile red-flag patterns into matchers
+
+    Literal phrases are matched in one Aho-Corasick pass over the lowercased
+    text, or without pyahocorasick, by a few combined alternation regexes.
+    Anything with regex syntax (e.g. '^um+') stays on the per-pattern regex
+    path. Every matcher runs on the lowercased text instead of using
+    re.IGNORECASE. Entries are (order, category, pattern) so flags keep the
+    original order.
+
+    Args:
+        categories: Tuple of (category, tuple of regex patterns)
+
+    Returns:
+        Tuple of (all_patterns, automaton or None, phrase_groups, regex_patterns)
+    """
+    all_patterns = {
+        category: [re.compile(p, re.IGNORECASE) for p in patterns]
+        for category, patterns in categories
+    }
+
+    regex_patterns = []
+    phrases = defaultdict(list)
+    order = 0
+    for category, patterns in all_patterns.items():
+        for pattern in patterns:
+            entry = (order, category, pattern.pattern)
+            phrase = _literal_phrase(pattern.pattern)
+            if phrase is None:
+                # Matched against lowercased text, so case folding is only
+                # needed when the pattern source itself has uppercase
+                source = pattern.pattern
+                flags = 0 if source == source.lower() else re.IGNORECASE
+                regex_patterns.append((entry, re.compile(source, flags)))
+            else:
+                phrases[phrase].append(entry)
+            order += 1
+
+    automaton = None
+    phrase_groups = []
+    if phrases and ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for phrase, entries in phrases.items():
+            automaton.add_word(phrase, tuple(entries))
+        automaton.make_automaton()
+    elif phrases:
+        phrase_groups = _build_phrase_groups(phrases)
+
+    return all_patterns, automaton, phrase_groups, regex_patterns
+
+
+def _build_phrase_groups(phrases):
+    """
+    Combine literal phrases into lookahead alternations
+
+    An alternation reports only one phrase per start position, so a phrase that
+    is a prefix of another (or vice versa) goes into a separate group. Each
+    group is a zero-width lookahead scanned with finditer, and the index of
+    the capturing group that matched identifies the phrase.
+
+    Args:
+        phrases: Dictionary of lowercase phrase -> list of pattern entries
+
+    Returns:
+        List of (compiled regex, tuple of entry lists per capturing group)
+    """
+    groups = []
+    for phrase, entries in phrases.items():
+        for group in groups:
+            if not any(other.startswith(phrase) or phrase.startswith(other) for other, _ in group):
+                group.append((phrase, entries))
+                break
+        else:
+            groups.append([(phrase, entries)])
+
+    return [
+        (
+            re.compile('(?=' + '|'.join(f'({re.escape(phrase)})' for phrase, _ in group) + ')', re.ASCII),
+            tuple(entries for _, entries in group)
+        )
+        for group in groups
+    ]
 
 
 class BehaviorAnalyzer:
@@ -118,13 +228,13 @@ class BehaviorAnalyzer:
             r'i\'m not certain',
         ]
 
-        # Compile all patterns
-        self.all_patterns = {
-            'evasive': [re.compile(p, re.IGNORECASE) for p in self.evasive_patterns],
-            'hostile': [re.compile(p, re.IGNORECASE) for p in self.hostile_patterns],
-            'suspicious': [re.compile(p, re.IGNORECASE) for p in self.suspicious_patterns],
-            'hesitation': [re.compile(p, re.IGNORECASE) for p in self.hesitation_patterns]
-        }
+        # Compile all patterns (cached per pattern set, shared across analyzers)
+        self.all_patterns, self.automaton, self.phrase_groups, self.regex_patterns = _compile_red_flags((
+            ('evasive', tuple(self.evasive_patterns)),
+            ('hostile', tuple(self.hostile_patterns)),
+            ('suspicious', tuple(self.suspicious_patterns)),
+            ('hesitation', tuple(self.hesitation_patterns))
+        ))
 
         # Severity weights
         self.severity_weights = {
@@ -134,12 +244,59 @@ class BehaviorAnalyzer:
             'hesitation': 0.5
         }
 
-    def analyze_text(self, text):
+    def _scan_texts(self, texts):
+        """
+        Find the red-flag patterns present in each of several texts
+
+        The lowercased texts are joined with a separator no phrase contains, so
+        the literal phrases are scanned once over the whole buffer and each
+        match is mapped back to its text by offset.
+
+        Args:
+            texts: List of texts
+
+        Returns:
+            List with a set of (order, category, pattern) entries per text
+        """
+        hits = [set() for _ in texts]
+        if not texts:
+            return hits
+
+        lowered = [text.lower() for text in texts]
+        buffer = '\x01'.join(lowered)
+        text_starts = np.cumsum([0] + [len(t) + 1 for t in lowered[:-1]])
+
+        positions = []
+        matched = []
+        if self.automaton is not None:
+            for end, entries in self.automaton.iter(buffer):
+                positions.append(end)
+                matched.append(entries)
+        for group_re, group_entries in self.phrase_groups:
+            for match in group_re.finditer(buffer):
+                positions.append(match.start())
+                matched.append(group_entries[match.lastindex - 1])
+
+        # Each pattern flags at most once per text, as with a per-pattern search
+        owners = np.searchsorted(text_starts, positions, side='right') - 1
+        for owner, entries in zip(owners.tolist(), matched):
+            hits[owner].update(entries)
+
+        # Anchored regexes ('^um+') have to see each text on its own
+        for text_hits, text in zip(hits, lowered):
+            for entry, pattern in self.regex_patterns:
+                if pattern.search(text):
+                    text_hits.add(entry)
+
+        return hits
+
+    def analyze_text(self, text, hits=None):
         """
         Analyze a single text segment for red flags
 
         Args:
             text: Text to analyze
+            hits: Pattern entries already found in the text by _scan_texts
 
         Returns:
             Dictionary with detected flags
@@ -147,19 +304,25 @@ class BehaviorAnalyzer:
         if not text:
             return {'flags': [], 'score': 0}
 
+        if hits is None:
+            hits = self._scan_texts([text])[0]
+
+        # Flags stay dicts: they are part of the saved/reported results
+        severity_weights = self.severity_weights
+        text_matched = text[:100]
         flags = []
+        append = flags.append
         total_score = 0
 
-        for category, patterns in self.all_patterns.items():
-            for pattern in patterns:
-                if pattern.search(text):
-                    flags.append({
-                        'category': category,
-                        'pattern': pattern.pattern,
-                        'text_matched': text[:100],
-                        'severity': self.severity_weights[category]
-                    })
-                    total_score += self.severity_weights[category]
+        for _, category, pattern in sorted(hits):
+            severity = severity_weights[category]
+            append({
+                'category': category,
+                'pattern': pattern,
+                'text_matched': text_matched,
+                'severity': severity
+            })
+            total_score += severity
 
         return {
             'flags': flags,
@@ -186,7 +349,7 @@ class BehaviorAnalyzer:
 
         results = {
             'segment_analysis': [],
-            'category_counts': defaultdict(int),
+            'category_counts': {},
             'total_flags': 0,
             'risk_score': 0,
             'flagged_segments': [],
@@ -195,15 +358,22 @@ class BehaviorAnalyzer:
 
         print(f"Analyzing {len(segments)} segments...")
 
-        for seg in segments:
-            text = seg.get('text', '')
-            speaker = seg.get('speaker', 'unknown')
+        # Category of every flag raised, in order; counts are taken once at the end
+        flag_categories = []
 
-            # Only analyze customer speech for behavioral flags
-            if speaker == 'agent':
-                continue
+        # Pull per-segment fields out once; the passes below index these lists
+        speakers = [seg.get('speaker', 'unknown') for seg in segments]
+        texts = [seg.get('text', '') for seg in segments]
 
-            analysis = self.analyze_text(text)
+        # Only analyze customer speech for behavioral flags
+        customer_indices = [i for i, speaker in enumerate(speakers) if speaker != 'agent']
+        segment_hits = self._scan_texts([texts[i] for i in customer_indices])
+
+        for i, hits in zip(customer_indices, segment_hits):
+            seg = segments[i]
+            text = texts[i]
+            speaker = speakers[i]
+            analysis = self.analyze_text(text, hits)
 
             seg_result = {
                 'timestamp': seg.get('start', 0),
@@ -218,14 +388,13 @@ class BehaviorAnalyzer:
 
             if analysis['has_red_flags']:
                 results['flagged_segments'].append(seg_result)
-                results['total_flags'] += len(analysis['flags'])
+                categories = [flag['category'] for flag in analysis['flags']]
+                flag_categories.extend(categories)
 
-                for flag in analysis['flags']:
-                    results['category_counts'][flag['category']] += 1
+                # Mark as critical once per suspicious flag
+                results['critical_flags'].extend([seg_result] * categories.count('suspicious'))
 
-                    # Mark as critical if suspicious category
-                    if flag['category'] == 'suspicious':
-                        results['critical_flags'].append(seg_result)
+        results['total_flags'] = len(flag_categories)
 
         # Calculate risk score (0-100)
         max_expected_flags = len(segments) * 0.1  # Expect <10% segments to have flags
@@ -236,7 +405,7 @@ class BehaviorAnalyzer:
             results['risk_score'] = 0
 
         # Analyze response patterns
-        results['response_patterns'] = self._analyze_response_patterns(segments)
+        results['response_patterns'] = self._analyze_response_patterns(segments, speakers, texts)
 
         # Determine behavior score (inverted - lower is better behavior)
         behavior_score = 100 - results['risk_score']
@@ -251,26 +420,31 @@ class BehaviorAnalyzer:
         else:
             results['risk_level'] = 'LOW'
 
-        # Convert defaultdict to regular dict
-        results['category_counts'] = dict(results['category_counts'])
+        results['category_counts'] = dict(Counter(flag_categories))
 
         self._print_summary(results)
 
         return results
 
-    def _analyze_response_patterns(self, segments):
+    def _analyze_response_patterns(self, segments, speakers=None, texts=None):
         """
         Analyze patterns in customer responses
 
         Args:
             segments: Transcript segments
+            speakers: Speaker of each segment, if already extracted
+            texts: Text of each segment, if already extracted
 
         Returns:
             Response pattern analysis
         """
-        customer_segments = [s for s in segments if s.get('speaker') == 'customer']
+        if speakers is None:
+            speakers = [s.get('speaker') for s in segments]
+        if texts is None:
+            texts = [s.get('text', '') for s in segments]
+        customer_texts = [text for speaker, text in zip(speakers, texts) if speaker == 'customer']
 
-        if not customer_segments:
+        if not customer_texts:
             return {
                 'average_response_length': 0,
                 'short_responses': 0,
@@ -278,29 +452,53 @@ class BehaviorAnalyzer:
             }
 
         # Calculate average response length
-        response_lengths = [len(s.get('text', '').split()) for s in customer_segments]
-        avg_length = sum(response_lengths) / len(response_lengths) if response_lengths else 0
+        response_lengths = np.fromiter(
+            (len(text.split()) for text in customer_texts),
+            dtype=np.int64,
+            count=len(customer_texts)
+        )
+        avg_length = float(response_lengths.mean())
 
         # Count very short responses (possibly evasive)
-        short_responses = sum(1 for l in response_lengths if l <= 3)
+        short_responses = int(np.count_nonzero(response_lengths <= 3))
 
         # Detect possible interruptions (responses that start very quickly)
-        interruptions = 0
-        for i, seg in enumerate(segments):
-            if seg.get('speaker') == 'customer' and i > 0:
-                prev_seg = segments[i - 1]
-                if prev_seg.get('speaker') == 'agent':
-                    response_gap = seg.get('start', 0) - prev_seg.get('end', 0)
-                    if response_gap < 0.3:  # Less than 0.3 second gap
-                        interruptions += 1
+        _, response_gaps = self._response_gaps(segments, speakers)
+        interruptions = int(np.count_nonzero(response_gaps < 0.3))  # Less than 0.3 second gap
 
         return {
             'average_response_length': round(avg_length, 2),
             'short_responses': short_responses,
-            'short_response_ratio': short_responses / len(customer_segments) if customer_segments else 0,
+            'short_response_ratio': short_responses / len(customer_texts) if customer_texts else 0,
             'interruptions': interruptions
         }
 
+    def _response_gaps(self, segments, speakers=None):
+        """
+        Find customer segments that directly follow an agent segment
+
+        Args:
+            segments: Transcript segments
+            speakers: Speaker of each segment, if already extracted
+
+        Returns:
+            Tuple of (segment indices, response gaps in seconds) as arrays
+        """
+        n = len(segments)
+        if n < 2:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        if speakers is None:
+            speakers = [s.get('speaker') for s in segments]
+        is_customer = np.fromiter((sp == 'customer' for sp in speakers), dtype=bool, count=n)
+        is_agent = np.fromiter((sp == 'agent' for sp in speakers), dtype=bool, count=n)
+        indices = np.flatnonzero(is_customer[1:] & is_agent[:-1]) + 1
+
+        # Only the paired segments' times are read
+        starts = np.fromiter((segments[i].get('start', 0) for i in indices), dtype=np.float64, count=len(indices))
+        ends = np.fromiter((segments[i - 1].get('end', 0) for i in indices), dtype=np.float64, count=len(indices))
+        return indices, starts - ends
+
     def analyze_timing(self, transcript):
         """
         Analyze timing patterns for suspicious behavior
@@ -318,43 +516,47 @@ class BehaviorAnalyzer:
         segments = transcript.get('segments', [])
 
         # Calculate response times
-        response_times = []
-        for i, seg in enumerate(segments):
-            if seg.get('speaker') == 'customer' and i > 0:
-                prev_seg = segments[i - 1]
-                if prev_seg.get('speaker') == 'agent':
-                    response_time = seg.get('start', 0) - prev_seg.get('end', 0)
-                    response_times.append({
-                        'timestamp': seg.get('start', 0),
-                        'response_time': response_time,
-                        'question': prev_seg.get('text', '')[:50],
-                        'answer': seg.get('text', '')[:50]
-                    })
-
-        if not response_times:
+        indices, response_times = self._response_gaps(segments)
+
+        if not len(response_times):
             return {
                 'average_response_time': 0,
                 'suspiciously_fast': 0,
                 'long_hesitations': 0
             }
 
-        avg_response = sum(r['response_time'] for r in response_times) / len(response_times)
+        # Sequential sum keeps the rounded average identical to the per-item loop
+        avg_response = sum(response_times.tolist()) / len(response_times)
 
         # Flag suspicious timings:
         # - Fast responses: Only flag if NEGATIVE (actual interruption)
         #   Don't flag 0-0.5s for TTS recordings - that's normal!
         # - Slow responses: Still flag long hesitations (>10s)
-        fast_responses = [r for r in response_times if r['response_time'] < 0]  # Changed from 0.5 to 0
-        slow_responses = [r for r in response_times if r['response_time'] > 10]  # Changed from 5 to 10
+        fast_mask = response_times < 0  # Changed from 0.5 to 0
+        slow_mask = response_times > 10  # Changed from 5 to 10
 
         return {
             'average_response_time': round(avg_response, 2),
-            'suspiciously_fast': len(fast_responses),
-            'long_hesitations': len(slow_responses),
-            'fast_response_details': fast_responses[:5],
-            'slow_response_details': slow_responses[:5]
+            'suspiciously_fast': int(np.count_nonzero(fast_mask)),
+            'long_hesitations': int(np.count_nonzero(slow_mask)),
+            'fast_response_details': self._response_details(segments, indices[fast_mask][:5]),
+            'slow_response_details': self._response_details(segments, indices[slow_mask][:5])
         }
 
+    def _response_details(self, segments, indices):
+        """Build response records for the given customer segment indices"""
+        details = []
+        for i in indices.tolist():
+            seg = segments[i]
+            prev_seg = segments[i - 1]
+            details.append({
+                'timestamp': seg.get('start', 0),
+                'response_time': seg.get('start', 0) - prev_seg.get('end', 0),
+                'question': prev_seg.get('text', '')[:50],
+                'answer': seg.get('text', '')[:50]
+            })
+        return details
+
     def _print_summary(self, results):
         """Print behavior analysis summary"""
         print(f"\n{'='*60}")
@@ -411,11 +613,26 @@ class BehaviorAnalyzer:
 
     def save_results(self, results, output_path):
         """Save behavior analysis results to JSON"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
         print(f"Behavior results saved to: {output_path}")
 
 
+_default_analyzer = None
+
+
+def _get_default_analyzer():
+    """Return the shared BehaviorAnalyzer used by analyze_behavior"""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = BehaviorAnalyzer()
+    return _default_analyzer
+
+
 def analyze_behavior(transcript, output_dir=None):
     """
     Convenience function to analyze behavior
@@ -431,7 +648,7 @@ def analyze_behavior(transcript, output_dir=None):
         with open(transcript, 'r', encoding='utf-8') as f:
             transcript = json.load(f)
 
-    analyzer = BehaviorAnalyzer()
+    analyzer = _get_default_analyzer()
     results = analyzer.get_behavior_score(transcript)
 
     if output_dir:
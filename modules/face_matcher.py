@@ -8,8 +8,50 @@ import os
 import cv2
 import numpy as np
 import json
+import threading
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DeepFace caches one face detector per backend process-wide (for 'opencv', a
+# CascadeClassifier that keeps per-call state), so calls that detect faces
+# must not overlap, even across FaceMatcher instances
+_DETECT_LOCK = threading.Lock()
+
+
+def _json_default(obj):
+    """Serialize numpy values the stdlib encoder doesn't handle"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        # ndarray.tolist() / generic.item()
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _decode(path, cache):
+    """
+    Decode an image once and serve repeat reads from memory
+
+    Args:
+        path: Image path
+        cache: Dict of path -> decoded image, owned by one comparison so the
+            images are released when it returns
+
+    Returns:
+        BGR uint8 array (read-only), or None if the file can't be read
+    """
+    if path in cache:
+        return cache[path]
+
+    img = cv2.imread(path)
+    if img is not None:
+        # Shared between callers, so guard it against in-place edits
+        img.flags.writeable = False
+    cache[path] = img
+    return img
+
 
 class FaceMatcher:
     """
@@ -17,7 +59,7 @@ class FaceMatcher:
     Compares faces extracted from video with reference document photos.
     """
 
-    def __init__(self, model_name='VGG-Face', detector_backend='opencv'):
+    def __init__(self, model_name='VGG-Face', detector_backend='opencv', blur_threshold=30.0):
         """
         Initialize face matcher
 
@@ -34,10 +76,14 @@ class FaceMatcher:
                 - 'ssd': Good balance
                 - 'mtcnn': High accuracy
                 - 'retinaface': Best accuracy
+            blur_threshold: Minimum Laplacian variance for a video face to be
+                compared; blurrier faces are skipped (0 disables the filter)
         """
         self.model_name = model_name
         self.detector_backend = detector_backend
+        self.blur_threshold = blur_threshold
         self.deepface = None
+        self.use_gpu = False
         self.is_initialized = False
 
         print(f"Initializing Face Matcher...")
@@ -48,6 +94,8 @@ class FaceMatcher:
 
     def _initialize(self):
         """Initialize DeepFace library"""
+        self.use_gpu = self._configure_gpu()
+
         try:
             from deepface import DeepFace
             self.deepface = DeepFace
@@ -71,6 +119,27 @@ class FaceMatcher:
             print(f"Error initializing face matcher: {e}")
             self.is_initialized = False
 
+    def _configure_gpu(self):
+        """
+        Let TensorFlow run DeepFace models on the GPU when one is visible
+
+        Returns:
+            True if a GPU is available
+        """
+        # Must be set before TensorFlow initializes its devices. Growing memory
+        # on demand keeps TF from reserving the whole card, which the torch
+        # based transcription models share.
+        os.environ.setdefault('TF_FORCE_GPU_ALLOW_GROWTH', 'true')
+
+        try:
+            import tensorflow as tf
+            gpus = tf.config.list_physical_devices('GPU')
+        except Exception:
+            gpus = []
+
+        print(f"  Device: {f'GPU ({len(gpus)})' if gpus else 'CPU'}")
+        return bool(gpus)
+
     def extract_face(self, image_path, save_path=None):
         """
         Extract face from an image
@@ -87,11 +156,12 @@ class FaceMatcher:
 
         try:
             # Extract face using DeepFace
-            faces = self.deepface.extract_faces(
-                img_path=image_path,
-                detector_backend=self.detector_backend,
-                enforce_detection=False
-            )
+            with _DETECT_LOCK:
+                faces = self.deepface.extract_faces(
+                    img_path=image_path,
+                    detector_backend=self.detector_backend,
+                    enforce_detection=False
+                )
 
             if not faces:
                 return {
@@ -144,13 +214,14 @@ class FaceMatcher:
 
         try:
             # Verify faces match
-            result = self.deepface.verify(
-                img1_path=image1_path,
-                img2_path=image2_path,
-                model_name=self.model_name,
-                detector_backend=self.detector_backend,
-                enforce_detection=False
-            )
+            with _DETECT_LOCK:
+                result = self.deepface.verify(
+                    img1_path=image1_path,
+                    img2_path=image2_path,
+                    model_name=self.model_name,
+                    detector_backend=self.detector_backend,
+                    enforce_detection=False
+                )
 
             # Convert distance to similarity percentage
             distance = result.get('distance', 1.0)
@@ -183,6 +254,66 @@ class FaceMatcher:
                 'image2': image2_path
             }
 
+    def _embed(self, img_path):
+        """
+        Embed every face found in an image
+
+        Args:
+            img_path: Image path or BGR array
+
+        Returns:
+            Array of L2-normalized embeddings, one row per face
+        """
+        with _DETECT_LOCK:
+            embedding_objs = self.deepface.represent(
+                img_path=img_path,
+                model_name=self.model_name,
+                detector_backend=self.detector_backend,
+                enforce_detection=False
+            )
+        embeddings = np.array([obj['embedding'] for obj in embedding_objs], dtype=np.float64)
+        if not len(embeddings):
+            return embeddings
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def _embed_face(self, face_path, cache):
+        """Embed a video face, returning (embeddings, error)"""
+        try:
+            embeddings = self._embed(self._load(face_path, cache))
+        except Exception as e:
+            return None, str(e)
+        if not len(embeddings):
+            return None, 'No face detected'
+        return embeddings, None
+
+    def _is_good_frame(self, face_path, cache):
+        """
+        Check whether a video face is sharp enough to be worth comparing
+
+        Args:
+            face_path: Path to face image
+            cache: Decoded images of the current comparison (see _decode)
+
+        Returns:
+            False if the image is blurrier than blur_threshold
+        """
+        img = _decode(face_path, cache)
+        if img is None:
+            # Keep unreadable files so the comparison reports the error
+            return True
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return cv2.Laplacian(gray, cv2.CV_64F).var() > self.blur_threshold
+
+    def _load(self, img_path, cache):
+        """Decoded image for DeepFace, falling back to the path so it reports read errors"""
+        img = _decode(img_path, cache)
+        return img_path if img is None else img
+
+    def _verification_threshold(self):
+        """Cosine distance threshold DeepFace.verify uses for this model"""
+        from deepface.commons import distance as dst
+        return dst.findThreshold(self.model_name, 'cosine')
+
     def compare_with_reference(self, reference_image_path, video_faces, top_n=5):
         """
         Compare reference document face with multiple video frame faces
@@ -195,24 +326,71 @@ class FaceMatcher:
         Returns:
             Comprehensive matching results
         """
-        print(f"\nComparing reference face with {len(video_faces)} video faces...")
+        # Images decoded for the blur check are reused for embedding; dropped on return
+        decoded = {}
 
-        results = []
+        # Drop blurry faces before spending a model forward pass on them
+        if self.blur_threshold:
+            sharp_faces = [p for p in video_faces if self._is_good_frame(p, decoded)]
+            if sharp_faces and len(sharp_faces) < len(video_faces):
+                print(f"\nSkipping {len(video_faces) - len(sharp_faces)} blurry video faces")
+                video_faces = sharp_faces
 
-        for i, face_path in enumerate(video_faces):
-            comparison = self.compare_faces(reference_image_path, face_path)
+        print(f"\nComparing reference face with {len(video_faces)} video faces...")
 
-            results.append({
-                'frame_face': face_path,
-                'verified': comparison.get('verified', False),
-                'similarity_score': comparison.get('similarity_score', 0),
-                'distance': comparison.get('distance', 1.0),
-                'error': comparison.get('error', None)
-            })
+        results = []
 
-            # Progress indicator
-            if (i + 1) % 10 == 0:
-                print(f"  Compared {i + 1}/{len(video_faces)} faces")
+        # Embed the reference once rather than inside every verify() call
+        try:
+            reference_embeddings = self._embed(self._load(reference_image_path, decoded))
+            reference_error = None if len(reference_embeddings) else 'No face detected'
+        except Exception as e:
+            reference_error = str(e)
+
+        if reference_error is not None:
+            results = [
+                {
+                    'frame_face': face_path,
+                    'verified': False,
+                    'similarity_score': 0,
+                    'distance': 1.0,
+                    'error': reference_error
+                }
+                for face_path in video_faces
+            ]
+        else:
+            threshold = self._verification_threshold()
+            embedded = []
+
+            for i, face_path in enumerate(video_faces):
+                embeddings, error = self._embed_face(face_path, decoded)
+                if error is None:
+                    embedded.append(embeddings)
+                results.append({
+                    'frame_face': face_path,
+                    'verified': False,
+                    'similarity_score': 0,
+                    'distance': 1.0,
+                    'error': error
+                })
+
+                # Progress indicator
+                if (i + 1) % 10 == 0:
+                    print(f"  Compared {i + 1}/{len(video_faces)} faces")
+
+            if embedded:
+                # Cosine distance of every frame face to every reference face in
+                # one matmul; like DeepFace.verify, each frame keeps its closest pair
+                stacked = np.vstack(embedded)
+                offsets = np.cumsum([0] + [len(e) for e in embedded[:-1]])
+                similarities = np.maximum.reduceat((stacked @ reference_embeddings.T).max(axis=1), offsets)
+                distances = (1 - similarities).tolist()
+
+                matched = (r for r in results if r['error'] is None)
+                for result, distance in zip(matched, distances):
+                    result['verified'] = distance <= threshold
+                    result['similarity_score'] = max(0, (1 - distance)) * 100
+                    result['distance'] = distance
 
         # Sort by similarity score (highest first)
         results.sort(key=lambda x: x['similarity_score'], reverse=True)
@@ -277,26 +455,16 @@ class FaceMatcher:
 
     def save_results(self, results, output_path):
         """Save matching results to JSON"""
-        # Convert numpy types to Python types for JSON serialization
-        def convert_types(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.bool_):
-                return bool(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {k: convert_types(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_types(i) for i in obj]
-            return obj
-
-        clean_results = convert_types(results)
-
+        if orjson is not None:
+            # orjson serializes numpy scalars and arrays itself
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            print(f"Face matching results saved to: {output_path}")
+            return
+
+        # numpy values are converted lazily by the encoder's default hook
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(clean_results, f, indent=2, ensure_ascii=False)
+            json.dump(results, f, indent=2, ensure_ascii=False, default=_json_default)
 
         print(f"Face matching results saved to: {output_path}")
 
@@ -10,11 +10,12 @@ from datetime import timedelta
 
 class TranscriptGenerator:
     """
-    Generates transcripts from audio using OpenAI Whisper.
+    Generates transcripts from audio using Whisper.
+    Uses faster-whisper (CTranslate2) when installed, OpenAI Whisper otherwise.
     Supports Hindi + English (code-mixing).
     """
 
-    def __init__(self, model_size='base'):
+    def __init__(self, model_size='base', compute_type='int8'):
         """
         Initialize Whisper model
 
@@ -25,15 +26,31 @@ class TranscriptGenerator:
                 - 'small': Better accuracy (~2GB VRAM)
                 - 'medium': High accuracy (~5GB VRAM)
                 - 'large': Best accuracy (~10GB VRAM)
+            compute_type: CTranslate2 precision for faster-whisper
+                - 'int8': Quantized, fastest on CPU (default)
+                - 'float16': Use on GPUs
+                - 'float32': Full precision
         """
         self.model_size = model_size
+        self.compute_type = compute_type
         self.model = None
+        self.backend = None
 
         print(f"Initializing Whisper ({model_size} model)...")
         self._load_model()
 
     def _load_model(self):
-        """Load Whisper model"""
+        """Load Whisper model (faster-whisper first, OpenAI Whisper as fallback)"""
+        try:
+            from faster_whisper import WhisperModel
+            self.model = WhisperModel(self.model_size, device='auto', compute_type=self.compute_type)
+            self.backend = 'faster-whisper'
+            print(f"faster-whisper {self.model_size} model loaded ({self.compute_type})")
+            return
+        except ImportError:
+            pass
+
+        self.backend = 'openai-whisper'
         try:
             import whisper
             self.model = whisper.load_model(self.model_size)
@@ -75,7 +92,10 @@ class TranscriptGenerator:
         if language:
             options['language'] = language
 
-        result = self.model.transcribe(audio_path, **options)
+        if self.backend == 'faster-whisper':
+            result = self._transcribe_faster_whisper(audio_path, language, task)
+        else:
+            result = self.model.transcribe(audio_path, **options)
 
         # Process segments
         segments = []
@@ -107,6 +127,28 @@ class TranscriptGenerator:
 
         return transcript_result
 
+    def _transcribe_faster_whisper(self, audio_path, language, task):
+        """Run faster-whisper and shape its output like OpenAI Whisper's result"""
+        segments_iter, info = self.model.transcribe(audio_path, language=language, task=task)
+
+        segments = [
+            {
+                'id': seg.id,
+                'start': seg.start,
+                'end': seg.end,
+                'text': seg.text,
+                'avg_logprob': seg.avg_logprob,
+                'no_speech_prob': seg.no_speech_prob
+            }
+            for seg in segments_iter
+        ]
+
+        return {
+            'text': ''.join(seg['text'] for seg in segments),
+            'segments': segments,
+            'language': info.language
+        }
+
     def transcribe_with_timestamps(self, audio_path, language=None):
         """
         Transcribe with word-level timestamps (if supported)
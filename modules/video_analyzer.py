@@ -27,12 +27,14 @@ class VideoAnalyzer:
     Orchestrates all modules to analyze a video and produce a decision.
     """
 
-    def __init__(self, output_base_dir='outputs/analysis'):
+    def __init__(self, output_base_dir='outputs/analysis', whisper_model=None):
         """
         Initialize the video analyzer
 
         Args:
             output_base_dir: Base directory for all output files
+            whisper_model: Optional Whisper model size to load up front
+                (otherwise loaded on first analysis)
         """
         self.output_base_dir = output_base_dir
 
@@ -43,7 +45,9 @@ class VideoAnalyzer:
 
         # Initialize all modules
         self.preprocessor = None  # Initialized per video
-        self.transcript_generator = None
+        self.transcript_generator = (
+            TranscriptGenerator(model_size=whisper_model) if whisper_model else None
+        )
         self.liveness_detector = LivenessDetector()
         self.face_matcher = None  # Lazy load (heavy)
         self.script_checker = ScriptChecker()
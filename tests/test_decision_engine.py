@@ -0,0 +1,50 @@
+"""
+Regression tests for the decision engine
+"""
+
+import math
+import unittest
+
+from engine.decision_engine import DecisionEngine
+
+
+def _module_results(face_score):
+    return {
+        'liveness': {'liveness_score': 100, 'is_live': True},
+        'face_match': {'score': face_score, 'confidence': 'HIGH'},
+        'script_compliance': {'score': 100},
+        'behavior': {'score': 100},
+        'consent': {'score': 100}
+    }
+
+
+class NaNScoreTest(unittest.TestCase):
+    """A module that scored NaN must not drop out of the decision"""
+
+    def setUp(self):
+        self.engine = DecisionEngine()
+
+    def test_nan_face_match_rejects(self):
+        result = self.engine.make_decision(_module_results(float('nan')))
+        self.assertEqual(result['decision'], 'REJECT')
+        self.assertTrue(math.isnan(result['final_score']))
+
+    def test_batch_matches_single(self):
+        sessions = [_module_results(float('nan')), _module_results(90), {}]
+        batch = self.engine.make_decisions_batch(sessions)
+        for module_results, result in zip(sessions, batch):
+            single = self.engine.make_decision(module_results)
+            self.assertEqual(result['decision'], single['decision'])
+            self.assertEqual(
+                math.isnan(result['final_score']) or result['final_score'],
+                math.isnan(single['final_score']) or single['final_score']
+            )
+
+    def test_missing_score_is_renormalized(self):
+        scores = {'liveness': 100, 'face_match': None, 'script_compliance': 100,
+                  'document_verification': 100, 'behavior': 100, 'consent': 100}
+        self.assertEqual(self.engine.calculate_weighted_score(scores), 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
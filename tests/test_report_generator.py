@@ -0,0 +1,25 @@
+"""
+Regression tests for the report generator
+"""
+
+import unittest
+
+from engine.report_generator import ReportGenerator
+
+
+class ConfidenceLevelTest(unittest.TestCase):
+    """Confidence labels for final scores"""
+
+    def setUp(self):
+        self.generator = ReportGenerator(quiet=True)
+
+    def test_thresholds(self):
+        levels = [self.generator._get_confidence_level(score) for score in (0, 49.99, 50, 70, 85, 100)]
+        self.assertEqual(levels, ['VERY LOW', 'VERY LOW', 'LOW', 'MEDIUM', 'HIGH', 'HIGH'])
+
+    def test_nan_score_is_very_low(self):
+        self.assertEqual(self.generator._get_confidence_level(float('nan')), 'VERY LOW')
+
+
+if __name__ == '__main__':
+    unittest.main()